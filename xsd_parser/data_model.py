@@ -1,5 +1,11 @@
 #!/usr/bin/env python3
 
+import collections
+import operator
+import re
+
+from . import datatypes
+from . import regular_expressions
 
 
 ###
@@ -27,8 +33,9 @@ class PropertyGroup:
 	def __init__(self, **properties):
 		pass
 
+	# NOTE: Private attributes (e.g. compiled forms of properties) are left out.
 	def __repr__(self):
-		return "{}({})".format(self.__class__.__name__, ", ".join(list(map(lambda x: "{}={}".format(x[0], repr(x[1])), sorted(self.__dict__.items())))))
+		return "{}({})".format(self.__class__.__name__, ", ".join(list(map(lambda x: "{}={}".format(x[0], repr(x[1])), sorted(x for x in self.__dict__.items() if not x[0].startswith("_"))))))
 
 	def get_required_property(self, properties, property_name):
 		property_value = properties.get(property_name)
@@ -192,6 +199,43 @@ class ComplexTypeDefinition(TypeDefinition):
 			raise TypeError("'assertions' must be a list of Assertion components")
 
 
+# NOTE: This is bumped whenever a constraining facet's value or fixed changes, or the facets or base type definition of a
+#       simple type definition do, so that what is derived from them (e.g. effective facets) is known to be current with
+#       a single comparison. Any change anywhere makes all of it stale.
+_facets_generation = 0
+
+def _facets_changed():
+	global _facets_generation
+
+	_facets_generation += 1
+
+def _changing(method):
+	def changed(self, *args):
+		_facets_changed()
+
+		return method(self, *args)
+
+	return changed
+
+# NOTE: The facets of a simple type definition are kept in this, so that changing them in place is noticed too.
+class _FacetSet(set):
+	add = _changing(set.add)
+	discard = _changing(set.discard)
+	remove = _changing(set.remove)
+	pop = _changing(set.pop)
+	clear = _changing(set.clear)
+	update = _changing(set.update)
+	difference_update = _changing(set.difference_update)
+	intersection_update = _changing(set.intersection_update)
+	symmetric_difference_update = _changing(set.symmetric_difference_update)
+	__ior__ = _changing(set.__ior__)
+	__iand__ = _changing(set.__iand__)
+	__isub__ = _changing(set.__isub__)
+	__ixor__ = _changing(set.__ixor__)
+
+	def __repr__(self):
+		return repr(set(self))
+
 
 # XSD 1.1, Part 1: 3.16.1 The Simple Type Definition Schema Component
 # XSD 1.1, Part 2: 4.1.1 The Simple Type Definition Schema Component
@@ -292,6 +336,83 @@ class SimpleTypeDefinitionBase(TypeDefinition):
 			else:
 				raise TypeError("'member_type_definitions' must be absent if 'variety' is not 'union'")
 
+		self._effective_facets = None
+
+	def __setattr__(self, name, value):
+		if name in { "facets", "base_type_definition" }:
+			_facets_changed()
+
+			if name == "facets":
+				value = _FacetSet(value)
+
+		super().__setattr__(name, value)
+
+	# NOTE: This yields the definition itself, then each ancestor up to (but not including) the first one that isn't a
+	#       simple type definition.
+	def base_type_definition_chain(self):
+		yield self
+
+		t = self.base_type_definition
+
+		while isinstance(t, SimpleTypeDefinitionBase):
+			yield t
+
+			t = t.base_type_definition
+
+	def builtin_datatype(self):
+		for t in self.base_type_definition_chain():
+			if t.target_namespace == xsd_namespace and t.name in builtin_datatypes:
+				return builtin_datatypes[t.name]
+
+		raise NotImplementedError("No built-in datatype is implemented for this Simple Type Definition")
+
+	# NOTE: The validator maps a literal to its value, raising TypeError if the literal is not valid for this type. It
+	#       holds everything it needs, so it should be compiled once and kept for as long as the definition is used.
+	#       Patterns are matched in linear time if 'linear_patterns' is set, as they should be for untrusted schemas, each
+	#       keeping at most 'max_states' states of its matcher.
+	def compile_validator(self, linear_patterns=False, max_states=1024):
+		# TODO: Support list and union types.
+		if self.variety != Keyword("atomic"):
+			raise NotImplementedError("Only atomic Simple Type Definitions can be validated")
+
+		return compile_atomic_validator(self.builtin_datatype(), self.effective_facets(), linear_patterns, max_states)
+
+	# XSD 1.1, Part 2: 4.3 Constraining Facets
+	# NOTE: This merges the facets of the definition into those of its base type definition, and is kept until any facet
+	#       or definition changes (see '_facets_generation'). A facet fixed in a base type definition can't be given
+	#       another value.
+	def effective_facets(self):
+		generation = _facets_generation
+
+		if self._effective_facets is not None and self._effective_facets[0] == generation:
+			return self._effective_facets[1]
+
+		base = self.base_type_definition.effective_facets() if isinstance(self.base_type_definition, SimpleTypeDefinitionBase) else None
+
+		facets = dict(base.facets) if base is not None else {}
+		patterns = list(base.patterns) if base is not None else []
+
+		for facet in self.facets:
+			if isinstance(facet, Pattern):
+				patterns.append(facet)
+
+				continue
+
+			inherited = facets.get(type(facet))
+
+			if inherited is not None and getattr(inherited, "fixed", False):
+				if facet.value != inherited.value:
+					raise TypeError("'{}' is fixed in a base type definition".format(type(facet).__name__))
+
+				continue
+
+			facets[type(facet)] = facet
+
+		effective_facets = EffectiveFacets(facets, tuple(patterns))
+		self._effective_facets = (generation, effective_facets)
+
+		return effective_facets
+
 
 # XSD 1.1, Part 1: 3.16.1 The Simple Type Definition Schema Component
 # XSD 1.1, Part 2: 4.1.1 The Simple Type Definition Schema Component
@@ -1136,6 +1257,12 @@ class ConstrainingFacet(AnnotatedComponent):
 	def __init__(self, **properties):
 		super().__init__(**properties)
 
+	def __setattr__(self, name, value):
+		if name in { "value", "fixed" }:
+			_facets_changed()
+
+		super().__setattr__(name, value)
+
 
 # XSD 1.1, Part 2: 4.3.1.1 The length Schema Component
 class Length(ConstrainingFacet):
@@ -1207,12 +1334,32 @@ class Pattern(ConstrainingFacet):
 
 		value = self.get_required_property(properties, "value")
 
-		# TODO: Enforce regular expressions on 'value'.
 		if isinstance(value, set) and (len(value) > 0) and all(isinstance(v, str) for v in value):
 			self.value = value
 		else:
 			raise TypeError("'value' must be a non-empty set of regular expressions")
 
+		self._regex = (frozenset(self.value), regular_expressions.compile_regex(*sorted(self.value)))
+
+	# XSD 1.1, Part 2: 4.3.4.3 Pattern Validation Rules
+	# NOTE: The regular expressions are alternatives, so they are compiled together. This raises TypeError if any of
+	#       them is not a regular expression, from the constructor for the initial values. As with the index of an
+	#       enumeration, the compiled pattern is kept until the values change.
+	@property
+	def regex(self):
+		key = frozenset(self.value)
+
+		if self._regex[0] != key:
+			self._regex = (key, regular_expressions.compile_regex(*sorted(key)))
+
+		return self._regex[1]
+
+	# NOTE: This matches in linear time, for patterns that could make 'regex' backtrack too long (e.g. '(a|aa)*b'), and
+	#       keeps at most 'max_states' states. Matchers are shared, so patterns with the same values share one. Counts
+	#       too large to unroll (e.g. '[0-9]{1000000}') raise TypeError here, though 'regex' takes them.
+	def linear_regex(self, max_states=1024):
+		return regular_expressions.compile_linear_regex(*sorted(self.value), max_states=max_states)
+
 
 # XSD 1.1, Part 2: 4.3.5.1 The enumeration Schema Component
 class Enumeration(ConstrainingFacet):
@@ -1227,6 +1374,22 @@ class Enumeration(ConstrainingFacet):
 		else:
 			raise TypeError("'value' must be a set of values from the value space of 'base_type_definition'")
 
+		self._value_index = None
+
+	# XSD 1.1, Part 2: 4.3.5.3 Enumeration Validation Rules
+	# NOTE: This gives the values, with literals mapped to values, and their canonical representations. A value is
+	#       enumerated if it is equal to one of the values (e.g. "1.0" and "1.00" as xs:decimal, or 0 and -0 as
+	#       xs:double) or identical to one, which the canonical representations find where equality doesn't (e.g. NaN).
+	#       Both are hashed, and kept until the datatype or the values change.
+	def value_index(self, datatype):
+		key = (datatype, frozenset(self.value))
+
+		if self._value_index is None or self._value_index[0] != key:
+			values = frozenset(datatype.parse(v) if isinstance(v, str) else v for v in self.value)
+			self._value_index = (key, (values, frozenset(datatype.format(v) for v in values)))
+
+		return self._value_index[1]
+
 
 # XSD 1.1, Part 2: 4.3.6.1 The whiteSpace Schema Component
 class WhiteSpace(ConstrainingFacet):
@@ -1401,3 +1564,140 @@ class ExplicitTimezone(ConstrainingFacet):
 			raise TypeError("'fixed' must be an xs:boolean fixed")
 
 
+####
+
+
+# XSD 1.1, Part 2: 3.2 Built-in Datatypes and Their Definitions
+xsd_namespace = "http://www.w3.org/2001/XMLSchema"
+
+builtin_datatypes = {
+	"string": datatypes.String,
+	"boolean": datatypes.Boolean,
+	"decimal": datatypes.Decimal,
+	"float": datatypes.Float,
+	"double": datatypes.Double,
+	"duration": datatypes.Duration,
+}
+
+# XSD 1.1, Part 2: 4.3.6 whiteSpace
+_white_space_runs = re.compile(r"[\t\n\r ]+")
+_white_space_replacements = str.maketrans("\t\n\r", "   ")
+
+def _replace_white_space(literal):
+	return literal.translate(_white_space_replacements)
+
+def _collapse_white_space(literal):
+	return _white_space_runs.sub(" ", literal).strip(" ")
+
+# XSD 1.1, Part 2: 4.3.11 totalDigits
+# XSD 1.1, Part 2: 4.3.12 fractionDigits
+# NOTE: This gives the fewest total and fraction digits with which the value can be written, read from the digits of
+#       the decimal.Decimal value, without arithmetic in the context precision.
+def _decimal_digits(value):
+	(sign, digits, exponent) = value.as_tuple()
+
+	if digits == (0,):
+		return (1, 0)
+
+	if exponent >= 0:
+		return (len(digits) + exponent, 0)
+
+	z = 0
+
+	while z < -exponent and digits[-1 - z] == 0:
+		z += 1
+
+	return (len(digits) - z, -exponent - z)
+
+def _total_digits(value):
+	return _decimal_digits(value)[0]
+
+def _fraction_digits(value):
+	return _decimal_digits(value)[1]
+
+# NOTE: Each check takes the whitespace-normalized literal and its value. Checks of the value alone come first, then the
+#       regular expressions, then enumeration. Those listed here compare a measure of the value (or, for None, the value
+#       itself) with the facet's value.
+_facet_checks = [
+	(Length, len, operator.eq),
+	(MinLength, len, operator.ge),
+	(MaxLength, len, operator.le),
+	(TotalDigits, _total_digits, operator.le),
+	(FractionDigits, _fraction_digits, operator.le),
+	(MinInclusive, None, operator.ge),
+	(MinExclusive, None, operator.gt),
+	(MaxInclusive, None, operator.le),
+	(MaxExclusive, None, operator.lt),
+]
+
+def _facet_check(measure, compare, n):
+	def check(literal, value):
+		return compare(value if measure is None else measure(value), n)
+
+	return check
+
+def _pattern_check(fullmatch):
+	def check(literal, value):
+		return bool(fullmatch(literal))
+
+	return check
+
+def _enumeration_check(values, canonical_values, format):
+	def check(literal, value):
+		return value in values or format(value) in canonical_values
+
+	return check
+
+# NOTE: 'facets' maps each kind of facet to the one that applies, taken from the most derived definition that specifies
+#       it (unless fixed further up). 'patterns' holds every pattern facet in the chain, as all must be satisfied.
+EffectiveFacets = collections.namedtuple("EffectiveFacets", ["facets", "patterns"])
+
+# XSD 1.1, Part 2: 4.1.4 Simple Type Definition Validation Rules
+# NOTE: Assertions and explicitTimezone are not checked.
+def compile_atomic_validator(datatype, effective_facets, linear_patterns=False, max_states=1024):
+	(facets, patterns) = effective_facets
+
+	white_space = facets[WhiteSpace].value if WhiteSpace in facets else Keyword("preserve" if datatype is datatypes.String else "collapse")
+	normalize = { Keyword("replace"): _replace_white_space, Keyword("collapse"): _collapse_white_space }.get(white_space)
+
+	checks = []
+
+	for (facet_type, measure, compare) in _facet_checks:
+		if facet_type in facets:
+			n = facets[facet_type].value
+
+			# NOTE: As with enumeration, bounds given as literals are mapped to values first.
+			if measure is None and isinstance(n, str):
+				n = datatype.parse(n)
+
+			checks.append((facets[facet_type], _facet_check(measure, compare, n)))
+
+	for facet in patterns:
+		checks.append((facet, _pattern_check(facet.linear_regex(max_states).fullmatch if linear_patterns else facet.regex.fullmatch)))
+
+	if Enumeration in facets:
+		(values, canonical_values) = facets[Enumeration].value_index(datatype)
+		checks.append((facets[Enumeration], _enumeration_check(values, canonical_values, datatype.format)))
+
+	parse = datatype.parse
+
+	def validate(literal):
+		datatypes.check_meets_condition(isinstance(literal, str), "a string", literal)
+
+		if normalize is not None:
+			literal = normalize(literal)
+
+		value = parse(literal)
+
+		for (facet, check) in checks:
+			try:
+				satisfied = check(literal, value)
+			except ArithmeticError:
+				satisfied = False
+
+			if not satisfied:
+				raise TypeError("Does not satisfy facet '{}': '{}'".format(facet.__class__.__name__, literal))
+
+		return value
+
+	return validate
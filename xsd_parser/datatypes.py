@@ -3,9 +3,20 @@
 import re
 import math
 import decimal
+import fractions
 import itertools
 import typing
 import abc
+import collections
+import copy
+import functools
+import threading
+import struct
+
+try:
+	import numpy
+except ImportError:
+	numpy = None
 
 ###
 
@@ -13,18 +24,247 @@ import abc
 # Internal type representations
 #
 
+# XSD 1.1, Part 2: 3.3.6.1 Value Space
+# NOTE: A duration value is a (months, seconds) pair. Being a named tuple, it is immutable, hashable and no larger than a
+#       two-slot object. Equality is identity in the value space, so P1M != P30D, and a plain tuple is never equal to one.
+class DurationValue(collections.namedtuple("DurationValue", ["months", "seconds"])):
+	__slots__ = ()
+
+	def __eq__(self, other: typing.Any) -> bool:
+		if not isinstance(other, DurationValue):
+			return False if isinstance(other, tuple) else NotImplemented
+
+		return tuple.__eq__(self, other)
+
+	def __ne__(self, other: typing.Any) -> bool:
+		if not isinstance(other, DurationValue):
+			return True if isinstance(other, tuple) else NotImplemented
+
+		return tuple.__ne__(self, other)
+
+	__hash__ = tuple.__hash__
+
+	# XSD 1.1, Part 2: 3.3.6.2 Order Relation on duration
+	# NOTE: Durations are partially ordered: one is less than another when it is less after adding both to each of four
+	#       reference dateTimes. Durations that are not comparable (e.g. P1M and P30D) are neither less nor greater.
+	def __lt__(self, other: typing.Any) -> bool:
+		if not isinstance(other, DurationValue):
+			return NotImplemented
+
+		# NOTE: Adding months or seconds never moves a dateTime backwards, so only opposing signs need the reference dateTimes.
+		if (self.months <= other.months and self.seconds <= other.seconds) or (self.months >= other.months and self.seconds >= other.seconds):
+			return self.months <= other.months and self.seconds <= other.seconds and self != other
+
+		return all(a < b for (a, b) in zip(self._referenceSeconds(), other._referenceSeconds()))
+
+	def __le__(self, other: typing.Any) -> bool:
+		if not isinstance(other, DurationValue):
+			return NotImplemented
+
+		return self == other or self < other
+
+	def __gt__(self, other: typing.Any) -> bool:
+		if not isinstance(other, DurationValue):
+			return NotImplemented
+
+		return other < self
+
+	def __ge__(self, other: typing.Any) -> bool:
+		if not isinstance(other, DurationValue):
+			return NotImplemented
+
+		return self == other or other < self
+
+	def _referenceSeconds(self) -> typing.List[decimal.Decimal]:
+		# NOTE: 1696-09-01, 1697-02-01, 1903-03-01 and 1903-07-01, each as a count of months. Adding months to the first of
+		#       a month never has to clamp the day.
+		return [_daysFromCivil(*divmod(m + self.months, 12)) * 86400 + self.seconds for m in [1696 * 12 + 8, 1697 * 12 + 1, 1903 * 12 + 2, 1903 * 12 + 6]]
+
+# NOTE: The number of days from 1970-01-01 to the first of the given (zero-based) month in the proleptic Gregorian calendar.
+def _daysFromCivil(y: int, m: int) -> int:
+	(y, m) = (y - 1, m + 10) if m < 2 else (y, m - 2)
+
+	return 365 * y + y // 4 - y // 100 + y // 400 + (153 * m + 2) // 5 - 719468
+
+# XSD 1.1, Part 2: 3.3.3.1 Value Space
+# NOTE: This is not in the specification. It is an exact alternative to decimal.Decimal for decimal values: the value
+#       coefficient * 10**-scale, with no context precision. Like decimal.Decimal, it remembers its scale (so 1.50 keeps
+#       a scale of 2), but equality, hashing and order are by value.
+_ScaledDecimal = typing.TypeVar("_ScaledDecimal", bound="ScaledDecimal")
+
+class ScaledDecimal(collections.namedtuple("ScaledDecimal", ["coefficient", "scale"])):
+	__slots__ = ()
+
+	# NOTE: A negative scale would make values equal without their normalized forms (and so their hashes) being equal.
+	def __new__(cls, coefficient: int, scale: int) -> "ScaledDecimal":
+		check_meets_condition(isinstance(coefficient, int) and not isinstance(coefficient, bool), "an integer coefficient", coefficient)
+		check_meets_condition(isinstance(scale, int) and not isinstance(scale, bool) and scale >= 0, "a nonnegative integer scale", scale)
+
+		return super().__new__(cls, coefficient, scale)
+
+	# NOTE: The namedtuple's '_make' (which '_replace' uses) builds the tuple directly, so it is checked here too. mypy
+	#       can't match a classmethod against the '_make' it synthesizes for namedtuples, hence the ignore.
+	@classmethod
+	def _make(cls: typing.Type[_ScaledDecimal], iterable: typing.Iterable[typing.Any]) -> _ScaledDecimal:  # type: ignore
+		return cls(*iterable)
+
+	@classmethod
+	def from_decimal(cls, d: decimal.Decimal) -> "ScaledDecimal":
+		check_meets_condition(isinstance(d, decimal.Decimal) and d.is_finite(), "a decimal value", d)
+
+		(sign, digits, exponent) = d.as_tuple()
+		c = int(decimal.Decimal((sign, digits, 0)))
+
+		assert isinstance(exponent, int)
+
+		if exponent > 0:
+			return cls(c * 10**exponent, 0)
+
+		return cls(c, -exponent)
+
+	# NOTE: Building the decimal number from its digits is exact, whatever the context precision.
+	def to_decimal(self) -> decimal.Decimal:
+		return decimal.Decimal((1 if self.coefficient < 0 else 0, decimal.Decimal(abs(self.coefficient)).as_tuple().digits, -self.scale))
+
+	def _normalized(self) -> typing.Tuple[int, int]:
+		(c, scale) = self
+
+		while scale > 0 and c % 10 == 0:
+			(c, scale) = (c // 10, scale - 1)
+
+		return (c, scale)
+
+	# NOTE: Both values are brought to the larger scale, which is exact.
+	def _aligned(self, other: "ScaledDecimal") -> typing.Tuple[int, int]:
+		scale = max(self.scale, other.scale)
+
+		return (self.coefficient * 10**(scale - self.scale), other.coefficient * 10**(scale - other.scale))
+
+	def __eq__(self, other: typing.Any) -> bool:
+		if not isinstance(other, ScaledDecimal):
+			return False if isinstance(other, tuple) else NotImplemented
+
+		(a, b) = self._aligned(other)
+
+		return a == b
+
+	def __ne__(self, other: typing.Any) -> bool:
+		if not isinstance(other, ScaledDecimal):
+			return True if isinstance(other, tuple) else NotImplemented
+
+		(a, b) = self._aligned(other)
+
+		return a != b
+
+	def __hash__(self) -> int:
+		return hash(self._normalized())
+
+	def __lt__(self, other: typing.Any) -> bool:
+		if not isinstance(other, ScaledDecimal):
+			return NotImplemented
+
+		(a, b) = self._aligned(other)
+
+		return a < b
+
+	def __le__(self, other: typing.Any) -> bool:
+		if not isinstance(other, ScaledDecimal):
+			return NotImplemented
+
+		(a, b) = self._aligned(other)
+
+		return a <= b
+
+	def __gt__(self, other: typing.Any) -> bool:
+		if not isinstance(other, ScaledDecimal):
+			return NotImplemented
+
+		(a, b) = self._aligned(other)
+
+		return a > b
+
+	def __ge__(self, other: typing.Any) -> bool:
+		if not isinstance(other, ScaledDecimal):
+			return NotImplemented
+
+		(a, b) = self._aligned(other)
+
+		return a >= b
+
 # Primitive Datatypes
 _String = str
 _Boolean = bool
 _Decimal = decimal.Decimal
 _Float = decimal.Decimal
 _Double = decimal.Decimal
-_Duration = typing.Dict[str, typing.Union[int, decimal.Decimal]]
+_Duration = DurationValue
 
 # Other Built-in Datatypes
 _YearMonthDuration = _Duration
 _DayTimeDuration = _Duration
 
+#
+# Conformance
+#
+
+# NOTE: The public mappings validate a literal once and then compute its value directly, trusting every fragment of it.
+#       Setting this routes them through the spec's definitions verbatim instead, re-validating each nested numeral and digit.
+spec_literal = False
+
+#
+# Decimal Context
+#
+
+# NOTE: The public mappings do their decimal arithmetic in a context of their own rather than the calling thread's, so
+#       that results never depend on the caller's precision, rounding or traps. Each thread gets its own copy of the
+#       configured context (contexts are not safe to share), rebuilt whenever 'configure_decimal_context' is called.
+#       Values already held in mapping caches are not remapped, so configure the context before enabling them.
+_decimalContextTemplate = decimal.Context(prec=28, rounding=decimal.ROUND_HALF_EVEN, traps=[decimal.InvalidOperation, decimal.DivisionByZero, decimal.Overflow])
+_decimalContextGeneration = 0
+_decimalContextLocal = threading.local()
+
+def configure_decimal_context(prec: int = 28, traps: typing.Iterable[typing.Type[decimal.DecimalException]] = (decimal.InvalidOperation, decimal.DivisionByZero, decimal.Overflow)) -> None:
+	global _decimalContextTemplate, _decimalContextGeneration
+
+	check_meets_condition(isinstance(prec, int) and not isinstance(prec, bool) and 0 < prec <= decimal.MAX_PREC, "a decimal precision", prec)
+
+	traps = list(traps)
+
+	check_meets_condition(all(isinstance(t, type) and issubclass(t, decimal.DecimalException) for t in traps), "a list of decimal signals", traps)
+
+	_decimalContextTemplate = decimal.Context(prec=prec, rounding=decimal.ROUND_HALF_EVEN, traps=traps)
+	_decimalContextGeneration += 1
+
+def decimal_context() -> decimal.Context:
+	if getattr(_decimalContextLocal, "generation", None) != _decimalContextGeneration:
+		_decimalContextLocal.context = _decimalContextTemplate.copy()
+		_decimalContextLocal.generation = _decimalContextGeneration
+
+	context = _decimalContextLocal.context  # type: decimal.Context
+
+	return context
+
+_Mapping = typing.TypeVar("_Mapping", bound=typing.Callable[..., typing.Any])
+
+# NOTE: Nested mappings find the context already in place and run directly.
+def in_decimal_context(mapping: _Mapping) -> _Mapping:
+	@functools.wraps(mapping)
+	def wrapped(*args: typing.Any, **kwargs: typing.Any) -> typing.Any:
+		context = decimal_context()
+		caller = decimal.getcontext()
+
+		if caller is context:
+			return mapping(*args, **kwargs)
+
+		decimal.setcontext(context)
+
+		try:
+			return mapping(*args, **kwargs)
+		finally:
+			decimal.setcontext(caller)
+
+	return typing.cast(_Mapping, wrapped)
+
 ###
 
 
@@ -35,9 +275,23 @@ def check_meets_condition(condition: bool, description: str, value: typing.Any)
 def production(regex: str) -> str:
 	return "(" + regex + ")"
 
-def check_matches_production(p: str, s: str) -> None:
-	if not re.fullmatch(p, s):
-		raise TypeError("Does not match production '{}': '{}'".format(p, s))
+def group(name: str, regex: str) -> str:
+	return "(?P<" + name + ">" + regex + ")"
+
+# NOTE: This turns every capturing group in a production into a non-capturing group.
+def uncaptured(regex: str) -> str:
+	return re.sub(r"(?<!\\)\((?!\?)", "(?:", regex)
+
+def match_production(p: typing.Union[str, typing.Pattern[str]], s: str) -> typing.Match[str]:
+	m = re.fullmatch(p, s) if isinstance(p, str) else p.fullmatch(s)
+
+	if not m:
+		raise TypeError("Does not match production '{}': '{}'".format(p if isinstance(p, str) else p.pattern, s))
+
+	return m
+
+def check_matches_production(p: typing.Union[str, typing.Pattern[str]], s: str) -> None:
+	match_production(p, s)
 
 
 ###
@@ -108,6 +362,85 @@ dayTimeDurationLexicalRep = r"-?P" + production(duDayTimeFrag)
 ###
 
 
+#
+# Compiled Productions
+#
+
+# NOTE: Each production is compiled exactly once, here, and every mapping below matches against these objects.
+#       Where a mapping needs part of a match, the production is restated with named groups; the alternations are
+#       factored so that each name occurs once (e.g. "N.F | .F" becomes "(?=\.?[0-9]) N* . F*").
+#       All other groups are non-capturing. 'test_compiled_productions' checks each one against its spec production.
+
+_optionalSign = group("sign", r"\+|-") + r"?"
+_unsignedNumeral = r"(?=\.?[0-9])" + group("integer", r"[0-9]*") + r"(?:" + group("point", r"\.") + group("fraction", r"[0-9]*") + r")?"
+_unsignedDecimalPtNumeral = r"(?=\.?[0-9])" + group("integer", r"[0-9]*") + group("point", r"\.") + group("fraction", r"[0-9]*")
+_floatingPointNumeral = group("special", uncaptured(numericalSpecialRep)) + r"|" + _optionalSign + _unsignedNumeral + r"(?:(?:e|E)" + group("exponent", uncaptured(noDecimalPtNumeral)) + r")?"
+
+_duYearMonthParts = r"(?:" + uncaptured(duYearFrag) + r")?(?:" + uncaptured(duMonthFrag) + r")?"
+_duTimeParts = r"T(?=.)(?:" + uncaptured(duHourFrag) + r")?(?:" + uncaptured(duMinuteFrag) + r")?(?:" + uncaptured(duSecondFrag) + r")?"
+_duDayTimeParts = r"(?:" + uncaptured(duDayFrag) + r")?(?:" + _duTimeParts + r")?"
+
+compiled_productions = { name: re.compile(regex) for (name, regex) in [
+	# XSD 1.1, Part 2: D.1.1 Exact Lexical Mappings
+	("digit", digit),
+	("unsignedNoDecimalPtNumeral", uncaptured(unsignedNoDecimalPtNumeral)),
+	("noDecimalPtNumeral", _optionalSign + group("unsigned", uncaptured(unsignedNoDecimalPtNumeral))),
+	("fracFrag", uncaptured(fracFrag)),
+	("unsignedDecimalPtNumeral", _unsignedDecimalPtNumeral),
+	("unsignedFullDecimalPtNumeral", uncaptured(unsignedFullDecimalPtNumeral)),
+	("decimalPtNumeral", _optionalSign + group("unsigned", _unsignedDecimalPtNumeral)),
+	("unsignedScientificNotationNumeral", group("coefficient", _unsignedNumeral) + r"(?:e|E)" + group("exponent", uncaptured(noDecimalPtNumeral))),
+	("scientificNotationNumeral", _optionalSign + group("coefficient", _unsignedNumeral) + r"(?:e|E)" + group("exponent", uncaptured(noDecimalPtNumeral))),
+	("minimalNumericalSpecialRep", uncaptured(minimalNumericalSpecialRep)),
+	("numericalSpecialRep", uncaptured(numericalSpecialRep)),
+
+	# XSD 1.1, Part 2: D.2.2 Lexical Mappings
+	("yearFrag", uncaptured(yearFrag)),
+	("monthFrag", uncaptured(monthFrag)),
+	("dayFrag", uncaptured(dayFrag)),
+	("hourFrag", uncaptured(hourFrag)),
+	("minuteFrag", uncaptured(minuteFrag)),
+	("secondFrag", uncaptured(secondFrag)),
+	("endOfDayFrag", uncaptured(endOfDayFrag)),
+	("timezoneFrag", uncaptured(timezoneFrag)),
+
+	# XSD 1.1, Part 2: 3.3 Primitive Datatypes
+	("stringRep", stringRep),
+	("booleanRep", booleanRep),
+	("decimalLexicalRep", _optionalSign + _unsignedNumeral),
+	("floatRep", _floatingPointNumeral),
+	("doubleRep", _floatingPointNumeral),
+
+	("duYearFrag", group("numeral", uncaptured(unsignedNoDecimalPtNumeral)) + r"Y"),
+	("duMonthFrag", group("numeral", uncaptured(unsignedNoDecimalPtNumeral)) + r"M"),
+	("duDayFrag", group("numeral", uncaptured(unsignedNoDecimalPtNumeral)) + r"D"),
+	("duHourFrag", group("numeral", uncaptured(unsignedNoDecimalPtNumeral)) + r"H"),
+	("duMinuteFrag", group("numeral", uncaptured(unsignedNoDecimalPtNumeral)) + r"M"),
+	("duSecondFrag", group("numeral", r"(?=\.?[0-9])[0-9]*" + group("point", r"\.") + r"?[0-9]*") + r"S"),
+	("duYearMonthFrag", r"(?=.)" + group("year", uncaptured(duYearFrag)) + r"?" + group("month", uncaptured(duMonthFrag)) + r"?"),
+	("duTimeFrag", r"T(?=.)" + group("hour", uncaptured(duHourFrag)) + r"?" + group("minute", uncaptured(duMinuteFrag)) + r"?" + group("second", uncaptured(duSecondFrag)) + r"?"),
+	("duDayTimeFrag", r"(?=.)" + group("day", uncaptured(duDayFrag)) + r"?" + group("time", _duTimeParts) + r"?"),
+	("durationLexicalRep", group("sign", r"-") + r"?P(?=.)" + group("yearMonth", _duYearMonthParts) + group("dayTime", _duDayTimeParts)),
+
+	# XSD 1.1, Part 2: 3.4 Other Built-in Datatypes
+	("yearMonthDurationLexicalRep", group("sign", r"-") + r"?P(?=.)" + group("yearMonth", _duYearMonthParts)),
+	("dayTimeDurationLexicalRep", group("sign", r"-") + r"?P(?=.)" + group("dayTime", _duDayTimeParts)),
+] }
+
+# NOTE: These productions match nothing but ASCII, so the UTF-8 bytes of a literal match them exactly when its characters
+#       match the string productions. They are matched against bytes, bytearrays and memoryviews in place.
+compiled_byte_productions = { name: re.compile(compiled_productions[name].pattern.encode("ascii")) for name in [
+	"booleanRep",
+	"decimalLexicalRep",
+	"floatRep",
+	"doubleRep",
+	"durationLexicalRep",
+] }
+
+
+###
+
+
 #
 # XSD 1.1, Part 2: E.1 Generic Number-related Functions
 #
@@ -115,7 +448,7 @@ dayTimeDurationLexicalRep = r"-?P" + production(duDayTimeFrag)
 # Auxiliary Functions for Operating on Numeral Fragments
 
 def _digitValue(d: str) -> int:
-	check_matches_production(digit, d)
+	check_matches_production(compiled_productions["digit"], d)
 
 	if d == "0":
 		value = 0
@@ -144,7 +477,7 @@ def _digitValue(d: str) -> int:
 
 def _digitSequenceValue(S: typing.Sequence[str]) -> int:
 	for s in S:
-		check_matches_production(digit, s)
+		check_matches_production(compiled_productions["digit"], s)
 
 	value = 0
 
@@ -157,7 +490,7 @@ def _digitSequenceValue(S: typing.Sequence[str]) -> int:
 # BUG: The spec says this returns an integer.
 def _fractionDigitSequenceValue(S: typing.Sequence[str]) -> decimal.Decimal:
 	for s in S:
-		check_matches_production(digit, s)
+		check_matches_production(compiled_productions["digit"], s)
 
 	value = decimal.Decimal()
 
@@ -170,10 +503,27 @@ def _fractionDigitSequenceValue(S: typing.Sequence[str]) -> decimal.Decimal:
 	return value.quantize(decimal.Decimal(10) ** -len(S))
 
 def _fractionFragValue(N: str) -> decimal.Decimal:
-	check_matches_production(fracFrag, N)
+	check_matches_production(compiled_productions["fracFrag"], N)
 
 	return _fractionDigitSequenceValue(N)
 
+# Auxiliary Functions for Operating on Validated Numerals
+
+# NOTE: These take numerals already known to match their production, so they skip the digit-by-digit definitions above.
+
+def _integerValue(N: str) -> int:
+	try:
+		return int(N)
+	except ValueError:
+		# NOTE: Very long numerals exceed the integer string conversion limit; decimal.Decimal has no such limit.
+		return int(decimal.Decimal(N))
+
+def _decimalValue(N: str) -> decimal.Decimal:
+	d = decimal.Decimal(N)
+
+	# NOTE: The spec has no negative zero in the decimal value space.
+	return d.copy_abs() if d.is_zero() else d
+
 # Auxiliary Functions for Producing Numeral Fragments
 
 def _digit(i : int) -> str:
@@ -253,6 +603,9 @@ def _fractionDigitSeq(f: decimal.Decimal) -> typing.Iterator[int]:
 def _fractionDigitsCanonicalFragmentMap(f: decimal.Decimal) -> str:
 	check_meets_condition(isinstance(f, decimal.Decimal) and f >= 0 and f < 1, "a nonnegative decimal number less than 1", f)
 
+	if not spec_literal:
+		return _fractionNumeral(f)
+
 	output = ""
 
 	stop = _lastSignificantDigit(_fractionDigitRemainderSeq(f))
@@ -265,40 +618,215 @@ def _fractionDigitsCanonicalFragmentMap(f: decimal.Decimal) -> str:
 
 	return output
 
+# Auxiliary Functions for Producing Numerals Directly
+
+# NOTE: These produce the same numerals as the spec's digit-by-digit definitions above.
+
+# NOTE: This holds 2**(2**k) for each k, as used by '_integerToDecimal'.
+_binaryPowers = {}  # type: typing.Dict[int, decimal.Decimal]
+
+# NOTE: This must be called in an exact context (see '_integerNumeral').
+def _integerToDecimal(i: int) -> decimal.Decimal:
+	n = i.bit_length()
+
+	if n <= 4096:
+		return decimal.Decimal(i)
+
+	k = (n - 1).bit_length() - 1
+
+	if k not in _binaryPowers:
+		_binaryPowers.setdefault(k, decimal.Decimal(2) ** (1 << k))
+
+	return _integerToDecimal(i >> (1 << k)) * _binaryPowers[k] + _integerToDecimal(i & ((1 << (1 << k)) - 1))
+
+def _integerNumeral(i: int) -> str:
+	try:
+		return "%d" % i
+	except ValueError:
+		# NOTE: Integers past the interpreter's string conversion limit are converted through decimal.Decimal instead,
+		#       splitting them in halves so that the cost stays close to linear in the number of digits.
+		with decimal.localcontext() as context:
+			context.prec = decimal.MAX_PREC
+			context.Emax = decimal.MAX_EMAX
+
+			return str(_integerToDecimal(i))
+
+# NOTE: Formatting a decimal number as fixed-point is exact and independent of the context precision.
+def _fractionNumeral(f: decimal.Decimal) -> str:
+	return "{:f}".format(f.copy_abs()).partition(".")[2].rstrip("0") or "0"
+
+def _decimalNumeral(n: decimal.Decimal) -> str:
+	(integer, _, fraction) = "{:f}".format(n.copy_abs()).partition(".")
+
+	return (integer.lstrip("0") or "0") + "." + (fraction.rstrip("0") or "0")
+
+# NOTE: The adjusted exponent of a nonzero decimal number is exactly the floor of its base-10 logarithm.
+def _scientificNumeral(n: decimal.Decimal) -> str:
+	digits = "".join(map(str, n.as_tuple().digits)).rstrip("0")
+
+	return digits[0] + "." + (digits[1:] or "0") + "E" + _integerNumeral(n.adjusted())
+
 # Auxiliary Functions for Binary Floating-point Lexical/Canonical Mappings
 
+# NOTE: Rounds (-1)**sign * c * 10**q to the nearest value of the form m * 2**e with 0 <= m <= 2**cWidth and eMin <= e,
+#       with ties to even, using integer arithmetic only. The result is exact whatever the size of 'c' or 'q'.
+def _binaryFloatingPointRound(sign: int, c: int, q: int, cWidth: int, eMin: int, eMax: int) -> decimal.Decimal:
+	if c == 0:
+		return decimal.Decimal(0)
+
+	# NOTE: Since 8**q <= 10**q <= 16**q for q >= 0 (and the reverse for q < 0), the bit length of 'c' bounds the magnitude
+	#       well enough to settle overflow and underflow before building any large power of ten.
+	if c.bit_length() - 1 + (3 * q if q >= 0 else 4 * q) > cWidth + eMax:
+		return decimal.Decimal(-math.inf if sign else math.inf)
+
+	if c.bit_length() + (4 * q if q >= 0 else 3 * q) < eMin - 1:
+		return decimal.Decimal(0)
+
+	(num, den) = (c * 10**q, 1) if q >= 0 else (c, 10**-q)
+
+	# NOTE: Find 'k' such that 2**k <= num / den < 2**(k + 1).
+	k = num.bit_length() - den.bit_length()
+
+	if (num if k >= 0 else num << -k) < (den << k if k >= 0 else den):
+		k -= 1
+
+	e = max(k - cWidth + 1, eMin)
+
+	(m, r) = divmod(num, den << e) if e >= 0 else divmod(num << -e, den)
+	half = den << e if e >= 0 else den
+
+	if 2 * r > half or (2 * r == half and m % 2 == 1):
+		m += 1
+
+	if m == 0:
+		return decimal.Decimal(0)
+
+	if m.bit_length() + e > cWidth + eMax:
+		return decimal.Decimal(-math.inf if sign else math.inf)
+
+	return _binaryFloatingPointValue(sign, m, e)
+
+# NOTE: Gives (-1)**sign * m * 2**e as a decimal exactly, whatever the context precision.
+def _binaryFloatingPointValue(sign: int, m: int, e: int) -> decimal.Decimal:
+	if e >= 0:
+		return decimal.Decimal(-(m << e) if sign else m << e)
+
+	# NOTE: Dropping the factors of two shared by 'm' and 2**e keeps the coefficient below free of trailing zeros.
+	z = min((m & -m).bit_length() - 1, -e)
+	(m, e) = (m >> z, e + z)
+
+	# NOTE: m * 2**e == m * 5**-e * 10**e, and a numeral is converted to a decimal exactly.
+	return decimal.Decimal("{}{}E{}".format("-" if sign else "", m * 5**-e, e))
+
+# NOTE: Maps a match of 'floatRep' or 'doubleRep' that is not a special value straight to its rounded value, without
+#       first computing the unrounded value (which would be subject to the context precision).
+def _floatingPointLexicalValue(m: typing.Match[str], cWidth: int, eMin: int, eMax: int) -> decimal.Decimal:
+	c = _integerValue(m.group("integer") + (m.group("fraction") or ""))
+	q = _integerValue(m.group("exponent") or "0") - len(m.group("fraction") or "")
+
+	nV = _binaryFloatingPointRound(1 if m.group("sign") == "-" else 0, c, q, cWidth, eMin, eMax)
+
+	if nV == 0:
+		return decimal.Decimal("-0") if m.group("sign") == "-" else decimal.Decimal("0")
+
+	return nV
+
+# NOTE: As '_floatingPointLexicalValue', for a literal already known to match 'floatRep' or 'doubleRep' and not to be a
+#       special value, split into its parts without a match.
+def _floatingPointNumeralValue(LEX: str, cWidth: int, eMin: int, eMax: int) -> decimal.Decimal:
+	(mantissa, _, exponent) = LEX.replace("e", "E").partition("E")
+	(integer, _, fraction) = mantissa.lstrip("+-").partition(".")
+
+	c = _integerValue(integer + fraction)
+	q = _integerValue(exponent or "0") - len(fraction)
+
+	nV = _binaryFloatingPointRound(1 if LEX[0] == "-" else 0, c, q, cWidth, eMin, eMax)
+
+	if nV == 0:
+		return decimal.Decimal("-0") if LEX[0] == "-" else decimal.Decimal("0")
+
+	return nV
+
 # NOTE: The spec uses inequalities to define variables relative to 'nV'.
 # XXX: This could be DRYed.
 def _floatingPointRound(nV: decimal.Decimal, cWidth: int, eMin: int, eMax: int) -> decimal.Decimal:
+	if not spec_literal:
+		(sign, digits, exponent) = nV.as_tuple()
+
+		# NOTE: The callers only round finite values, whose exponent is an integer.
+		assert isinstance(exponent, int)
+
+		return _binaryFloatingPointRound(sign, int(decimal.Decimal((0, digits, 0))), exponent, cWidth, eMin, eMax)
+
+	# NOTE: The spec's variables are computed from the exact ratio of 'nV', so its inequalities hold as stated. Values
+	#       too far out of range for the ratio to be worth building are settled from their adjusted exponent first, since
+	#       2**(3 * n) <= 10**n for n >= 0 and 10**n <= 2**(3 * n) for n <= 0.
+	# NOTE: This rounding is exact, but the lexical mappings compute 'nV' itself in the decimal context, so literals with
+	#       more significant digits than its precision can raise decimal.InvalidOperation (where the spec quantizes) or be
+	#       rounded twice, and exponents beyond its range raise decimal.Overflow.
 	s = -1 if nV < 0 else 1
 
-	e = math.ceil(math.log2(abs(nV))) - cWidth
-	c = math.ceil(abs(nV) / decimal.Decimal(2**e))
+	if 3 * nV.adjusted() > cWidth + eMax:
+		return decimal.Decimal(math.inf if s > 0 else -math.inf)
 
-	if eMax < e:
-		if s > 0:
-			return decimal.Decimal(math.inf)
+	if 3 * (nV.adjusted() + 1) < eMin - 1:
+		return decimal.Decimal(0)
 
-		return decimal.Decimal(-math.inf)
+	r = fractions.Fraction(*abs(nV).as_integer_ratio())
+	k = r.numerator.bit_length() - r.denominator.bit_length()
+
+	if r < fractions.Fraction(2)**k:
+		k -= 1
+
+	e = (k if r == fractions.Fraction(2)**k else k + 1) - cWidth
+	c = math.ceil(r / fractions.Fraction(2)**e)
+
+	if eMax < e:
+		return decimal.Decimal(math.inf if s > 0 else -math.inf)
 
 	if e < eMin:
 		e = eMin
-		c = math.ceil(abs(nV) / decimal.Decimal(2**e))
+		c = math.ceil(r / fractions.Fraction(2)**e)
+
+	half = fractions.Fraction(2)**(e - 1)
 
-	if abs(nV) > c * 2**e - 2**(e-1):
-		nV = c * 2**e
-	elif abs(nV) < c * 2**e - 2**(e-1):
-		nV = (c - 1) * 2**e
+	if r > c * fractions.Fraction(2)**e - half:
+		m = c
+	elif r < c * fractions.Fraction(2)**e - half:
+		m = c - 1
 	else:
-		nV = c * 2**e if c % 2 == 0 else (c - 1) * 2**e
+		m = c if c % 2 == 0 else c - 1
 
-	if nV < 2**cWidth * 2**eMax:
-		return decimal.Decimal(str(s * nV))
+	if m * fractions.Fraction(2)**e < fractions.Fraction(2)**(cWidth + eMax):
+		return _binaryFloatingPointValue(1 if s < 0 else 0, m, e) if m != 0 else decimal.Decimal(0)
 
-	if s > 0:
-		return decimal.Decimal(math.inf)
+	return decimal.Decimal(math.inf if s > 0 else -math.inf)
+
+# NOTE: Finds the nearest numeral with the fewest significant digits that maps back to the same value (the spec's 'l').
+#       Every float value is recovered from 9 significant digits, and the nearest numeral of p + 1 digits is never further
+#       away than that of p digits, so the number of digits can be bisected. For double, 'repr' already finds this numeral.
+def _shortestFloatNumeral(nV: decimal.Decimal) -> str:
+	x = float(nV)
+
+	def numeral(p: int) -> typing.Tuple[str, str]:
+		(coefficient, _, exponent) = "{:.{}e}".format(abs(x), p - 1).partition("e")
 
-	return decimal.Decimal(-math.inf)
+		return (coefficient, exponent)
+
+	(lo, hi) = (1, 9)
+
+	while lo < hi:
+		p = (lo + hi) // 2
+		(coefficient, exponent) = numeral(p)
+
+		if _binaryFloatingPointRound(0, int(coefficient.replace(".", "")), int(exponent) - p + 1, 24, -149, 104) == nV.copy_abs():
+			hi = p
+		else:
+			lo = p + 1
+
+	(coefficient, exponent) = numeral(lo)
+
+	return ("-" if x < 0 else "") + coefficient + "E" + exponent
 
 def _round(n: decimal.Decimal, k: int) -> decimal.Decimal:
 	return (((n / 10**k) + decimal.Decimal(0.5)) // 1) * 10**k
@@ -313,81 +841,134 @@ def _floatApprox(c: int, e: int, j: int) -> decimal.Decimal:
 
 # BUG: The spec says "followed by" when it means "preceded by".
 def _duYearFragmentMap(Y: str) -> int:
-	m = re.fullmatch(duYearFrag, Y)
+	m = match_production(compiled_productions["duYearFrag"], Y)
 
-	N = m.group(1)
+	N = m.group("numeral")
 
-	return noDecimalMap(N)
+	return noDecimalMap(N, validate=False)
 
 # BUG: The spec says "followed by" when it means "preceded by".
 def _duMonthFragmentMap(M: str) -> int:
-	m = re.fullmatch(duMonthFrag, M)
+	m = match_production(compiled_productions["duMonthFrag"], M)
 
-	N = m.group(1)
+	N = m.group("numeral")
 
-	return noDecimalMap(N)
+	return noDecimalMap(N, validate=False)
 
 # BUG: The spec says "followed by" when it means "preceded by".
 def _duDayFragmentMap(D: str) -> int:
-	m = re.fullmatch(duDayFrag, D)
+	m = match_production(compiled_productions["duDayFrag"], D)
 
-	N = m.group(1)
+	N = m.group("numeral")
 
-	return noDecimalMap(N)
+	return noDecimalMap(N, validate=False)
 
 # BUG: The spec says "followed by" when it means "preceded by".
 def _duHourFragmentMap(H: str) -> int:
-	m = re.fullmatch(duHourFrag, H)
+	m = match_production(compiled_productions["duHourFrag"], H)
 
-	N = m.group(1)
+	N = m.group("numeral")
 
-	return noDecimalMap(N)
+	return noDecimalMap(N, validate=False)
 
 # BUG: The spec says "followed by" when it means "preceded by".
 def _duMinuteFragmentMap(M: str) -> int:
-	m = re.fullmatch(duMinuteFrag, M)
+	m = match_production(compiled_productions["duMinuteFrag"], M)
 
-	N = m.group(1)
+	N = m.group("numeral")
 
-	return noDecimalMap(N)
+	return noDecimalMap(N, validate=False)
 
 # BUG: The spec says "followed by" when it means "preceded by".
 def _duSecondFragmentMap(S: str) -> decimal.Decimal:
-	m = re.fullmatch(duSecondFrag, S)
+	m = match_production(compiled_productions["duSecondFrag"], S)
 
-	N = m.group(1)
+	N = m.group("numeral")
 
-	if m.group(4) is not None:
-		return decimalPtMap(N)
+	if m.group("point") is not None:
+		return decimalPtMap(N, validate=False)
 
-	return decimal.Decimal(noDecimalMap(N))
+	return decimal.Decimal(noDecimalMap(N, validate=False))
 
 def _duYearMonthFragmentMap(YM: str) -> int:
-	m = re.fullmatch(duYearMonthFrag, YM)
+	m = match_production(compiled_productions["duYearMonthFrag"], YM)
 
-	y = _duYearFragmentMap(m.group(2)) if m.group(2) is not None else 0
-	mi = _duMonthFragmentMap(m.group(5)) if m.group(5) is not None else _duMonthFragmentMap(m.group(8)) if m.group(8) is not None else 0
+	y = _duYearFragmentMap(m.group("year")) if m.group("year") is not None else 0
+	mi = _duMonthFragmentMap(m.group("month")) if m.group("month") is not None else 0
 
 	return 12 * y + mi
 
 def _duTimeFragmentMap(T: str) -> decimal.Decimal:
-	m = re.fullmatch(duTimeFrag, T)
+	m = match_production(compiled_productions["duTimeFrag"], T)
 
 	# BUG: The spec says 'duDayFragmentMap' when it means 'duHourFragmentMap'.
-	h = _duHourFragmentMap(m.group(3)) if m.group(3) is not None else 0
-	mi = _duMinuteFragmentMap(m.group(6)) if m.group(6) is not None else _duMinuteFragmentMap(m.group(23)) if m.group(23) is not None else 0
-	s = _duSecondFragmentMap(m.group(9)) if m.group(9) is not None else _duSecondFragmentMap(m.group(26)) if m.group(26) is not None else _duSecondFragmentMap(m.group(39)) if m.group(39) is not None else decimal.Decimal(0)
+	h = _duHourFragmentMap(m.group("hour")) if m.group("hour") is not None else 0
+	mi = _duMinuteFragmentMap(m.group("minute")) if m.group("minute") is not None else 0
+	s = _duSecondFragmentMap(m.group("second")) if m.group("second") is not None else decimal.Decimal(0)
 
 	return decimal.Decimal(3600 * h + 60 * mi + s)
 
 def _duDayTimeFragmentMap(DT: str) -> decimal.Decimal:
-	m = re.fullmatch(duDayTimeFrag, DT)
+	m = match_production(compiled_productions["duDayTimeFrag"], DT)
 
-	d = _duDayFragmentMap(m.group(2)) if m.group(2) is not None else 0
-	t = _duTimeFragmentMap(m.group(5)) if m.group(5) is not None else _duTimeFragmentMap(m.group(57)) if m.group(57) is not None else decimal.Decimal(0)
+	d = _duDayFragmentMap(m.group("day")) if m.group("day") is not None else 0
+	t = _duTimeFragmentMap(m.group("time")) if m.group("time") is not None else decimal.Decimal(0)
 
 	return decimal.Decimal(86400 * d + t)
 
+# NOTE: This is not in the specification. It reads a duration literal in a single pass, returning its sign and the numerals
+#       for Y, M, D, H, M and S (None where absent), or None if the literal is not in the lexical space. Only the
+#       designators from 'first' up to (but not including) 'last' are allowed, in that order.
+def _scanDuration(DUR: str, first: int, last: int) -> typing.Optional[typing.Tuple[int, typing.List[typing.Optional[str]]]]:
+	n = len(DUR)
+	i = 1 if DUR[:1] == "-" else 0
+
+	if DUR[i:i + 1] != "P" or i + 1 == n:
+		return None
+
+	numerals = [None] * 6  # type: typing.List[typing.Optional[str]]
+	rank = first
+	time = False
+	i += 1
+
+	while i < n:
+		if DUR[i] == "T":
+			if time or last <= 3 or i + 1 == n:
+				return None
+
+			(time, rank) = (True, max(rank, 3))
+			i += 1
+
+			continue
+
+		j = i
+
+		while j < n and "0" <= DUR[j] <= "9":
+			j += 1
+
+		point = j < n and DUR[j] == "."
+
+		if point:
+			j += 1
+
+			while j < n and "0" <= DUR[j] <= "9":
+				j += 1
+
+		if j == n or j == i + point:
+			return None
+
+		# NOTE: Hours, minutes and seconds follow "T", and only seconds may have a fractional part.
+		r = "HMS".find(DUR[j]) + 3 if time else "YMD".find(DUR[j])
+
+		if r < rank or r >= last or (point and r != 5):
+			return None
+
+		numerals[r] = DUR[i:j]
+		rank = r + 1
+		i = j + 1
+
+	return (-1 if DUR[0] == "-" else 1, numerals)
+
 # XXX: This could be DRYed.
 def _duYearMonthCanonicalFragmentMap(ym: int) -> str:
 	y = ym // 12
@@ -420,6 +1001,19 @@ def _duTimeCanonicalFragmentMap(h: int, m: int, s: decimal.Decimal) -> str:
 	return "T" + _duHourCanonicalFragmentMap(h) + _duMinuteCanonicalFragmentMap(m) + _duSecondCanonicalFragmentMap(s) if h != 0 or m != 0 or s != 0 else ""
 
 def _duDayTimeCanonicalFragmentMap(ss: decimal.Decimal) -> str:
+	# NOTE: Whole numbers of seconds are split with integer arithmetic, which is exact and needs no decimal context.
+	if not spec_literal and ss == ss.to_integral_value():
+		if ss == 0:
+			return "T0S"
+
+		(days, r) = divmod(int(ss), 86400)
+		(hours, r) = divmod(r, 3600)
+		(minutes, seconds) = divmod(r, 60)
+
+		time = ("%dH" % hours if hours else "") + ("%dM" % minutes if minutes else "") + ("%dS" % seconds if seconds else "")
+
+		return (_integerNumeral(days) + "D" if days else "") + ("T" + time if time else "")
+
 	d = int(ss // 86400)
 	h = int((ss % 86400) // 3600)
 	m = int((ss % 3600) // 60)
@@ -439,67 +1033,94 @@ def _duDayTimeCanonicalFragmentMap(ss: decimal.Decimal) -> str:
 
 # Generic Numeral-to-Number Lexical Mappings
 
-def unsignedNoDecimalMap(N: str) -> int:
-	check_matches_production(unsignedNoDecimalPtNumeral, N)
+def unsignedNoDecimalMap(N: str, validate: bool = True) -> int:
+	if validate or spec_literal:
+		check_matches_production(compiled_productions["unsignedNoDecimalPtNumeral"], N)
+
+	if not spec_literal:
+		return _integerValue(N)
 
 	return _digitSequenceValue(N)
 
-def noDecimalMap(N: str) -> int:
-	check_matches_production(noDecimalPtNumeral, N)
+def noDecimalMap(N: str, validate: bool = True) -> int:
+	if not spec_literal:
+		if validate:
+			check_matches_production(compiled_productions["noDecimalPtNumeral"], N)
+
+		return _integerValue(N)
 
-	m = re.fullmatch(noDecimalPtNumeral, N)
+	m = match_production(compiled_productions["noDecimalPtNumeral"], N)
 
-	sign = m.group(1)
-	U = m.group(2)
+	sign = m.group("sign")
+	U = m.group("unsigned")
 
 	if sign == "-":
 		return -1 * unsignedNoDecimalMap(U)
 
 	return unsignedNoDecimalMap(U)
 
-def unsignedDecimalPtMap(D: str) -> decimal.Decimal:
-	check_matches_production(unsignedDecimalPtNumeral, D)
+@in_decimal_context
+def unsignedDecimalPtMap(D: str, validate: bool = True) -> decimal.Decimal:
+	if not spec_literal:
+		if validate:
+			check_matches_production(compiled_productions["unsignedDecimalPtNumeral"], D)
 
-	m = re.fullmatch(unsignedDecimalPtNumeral, D)
+		return _decimalValue(D)
 
-	N = m.group(2)
-	F = m.group(4) if m.group(4) is not None else m.group(7)
+	m = match_production(compiled_productions["unsignedDecimalPtNumeral"], D)
 
-	if F is None:
+	# NOTE: Either of these may be empty, but not both.
+	N = m.group("integer")
+	F = m.group("fraction")
+
+	if not F:
 		value = decimal.Decimal(unsignedNoDecimalMap(N))
-	elif N is None:
+	elif not N:
 		value = _fractionFragValue(F)
 	else:
 		value = decimal.Decimal(unsignedNoDecimalMap(N)) + _fractionFragValue(F)
 
-	return value.quantize(decimal.Decimal(10) ** -(len(F) if F is not None else 0))
+	return value.quantize(decimal.Decimal(10) ** -len(F))
+
+@in_decimal_context
+def decimalPtMap(N: str, validate: bool = True) -> decimal.Decimal:
+	if not spec_literal:
+		if validate:
+			check_matches_production(compiled_productions["decimalPtNumeral"], N)
 
-def decimalPtMap(N: str) -> decimal.Decimal:
-	check_matches_production(decimalPtNumeral, N)
+		return _decimalValue(N)
 
-	m = re.fullmatch(decimalPtNumeral, N)
+	m = match_production(compiled_productions["decimalPtNumeral"], N)
 
-	sign = m.group(1)
-	U = m.group(2)
+	sign = m.group("sign")
+	U = m.group("unsigned")
 
 	if sign == "-":
 		return -unsignedDecimalPtMap(U)
 
 	return unsignedDecimalPtMap(U)
 
-def scientificMap(N: str) -> decimal.Decimal:
-	check_matches_production(scientificNotationNumeral, N)
+@in_decimal_context
+def scientificMap(N: str, validate: bool = True) -> decimal.Decimal:
+	if not spec_literal:
+		if validate:
+			check_matches_production(compiled_productions["scientificNotationNumeral"], N)
+
+		(C, _, E) = N.replace("E", "e").partition("e")
 
-	m = re.fullmatch(scientificNotationNumeral, N)
+		# NOTE: This keeps the spec's arithmetic below so that the result has the same exponent.
+		return decimal.Decimal(decimal.Decimal(C) * decimal.Decimal(10)**_integerValue(E))
 
-	sign = -1 if m.group(1) is not None else +1
-	C = m.group(3)
-	E = m.group(16)
+	m = match_production(compiled_productions["scientificNotationNumeral"], N)
+
+	sign = -1 if m.group("sign") == "-" else +1
+	C = m.group("coefficient")
+	E = m.group("exponent")
 
 	# BUG: The spec remaps the sign from 'scientificMap' onto 'unsignedNoDecimalPtNumeral' and 'unsignedDecimalPtNumeral'
 	#       to make them 'noDecimalPtNumeral' and 'decimalPtNumeral', which doesn't really work.
 	# BUG: The spec says 'unsignedDecimalPtMap' when it means 'noDecimalMap'.
-	if m.group(6) is not None:
+	if m.group("point") is not None:
 		value = unsignedDecimalPtMap(C) * decimal.Decimal(10)**noDecimalMap(E)
 	else:
 		value = unsignedNoDecimalMap(C) * decimal.Decimal(10)**noDecimalMap(E)
@@ -511,6 +1132,9 @@ def scientificMap(N: str) -> decimal.Decimal:
 def unsignedNoDecimalPtCanonicalMap(i: int) -> str:
 	check_meets_condition(isinstance(i, int) and i >= 0, "a nonnegative integer", i)
 
+	if not spec_literal:
+		return _integerNumeral(i)
+
 	canonical_representation = ""
 
 	for j, d in enumerate(_digitSeq(i)):  # pragma: no branch
@@ -529,24 +1153,36 @@ def noDecimalPtCanonicalMap(i: int) -> str:
 
 	return unsignedNoDecimalPtCanonicalMap(i)
 
+@in_decimal_context
 def unsignedDecimalPtCanonicalMap(n: decimal.Decimal) -> str:
-	check_meets_condition(isinstance(n, decimal.Decimal) and n >= 0, "a nonnegative decimal number", n)
+	check_meets_condition(isinstance(n, decimal.Decimal) and n.is_finite() and n >= 0, "a nonnegative decimal number", n)
+
+	if not spec_literal:
+		return _decimalNumeral(n)
 
 	return unsignedNoDecimalPtCanonicalMap(int(n // 1)) + "." + _fractionDigitsCanonicalFragmentMap(n % 1)
 
+@in_decimal_context
 def decimalPtCanonicalMap(i: decimal.Decimal) -> str:
+	check_meets_condition(isinstance(i, decimal.Decimal), "a decimal number", i)
+
 	if i < 0:
-		return "-" + unsignedDecimalPtCanonicalMap(-i)
+		return "-" + unsignedDecimalPtCanonicalMap(i.copy_abs())
 
 	return unsignedDecimalPtCanonicalMap(i)
 
+@in_decimal_context
 def unsignedScientificCanonicalMap(n: decimal.Decimal) -> str:
 	# BUG: The spec doesn't handle the possibility of n = 0, even though n is "nonnegative".
 	if n == 0:
 		return unsignedDecimalPtCanonicalMap(decimal.Decimal(0)) + "E" + noDecimalPtCanonicalMap(0)
 
+	if not spec_literal:
+		return _scientificNumeral(n)
+
 	return unsignedDecimalPtCanonicalMap(n / decimal.Decimal(10**decimal.Decimal(math.log10(n) // 1))) + "E" + noDecimalPtCanonicalMap(int(math.log10(n) // 1))
 
+@in_decimal_context
 def scientificCanonicalMap(n: decimal.Decimal) -> str:
 	if n < 0:
 		return "-" + unsignedScientificCanonicalMap(-n)
@@ -555,6 +1191,8 @@ def scientificCanonicalMap(n: decimal.Decimal) -> str:
 
 # Lexical Mapping for Non-numerical 'Special Values' Used With Numerical Datatypes
 
+_specialReps = frozenset({ "INF", "+INF", "-INF", "NaN" })
+
 def specialRepValue(S: str) -> decimal.Decimal:
 	if S in { "INF", "+INF" }:
 		return decimal.Decimal(math.inf)
@@ -579,42 +1217,78 @@ def specialRepCanonicalMap(c: decimal.Decimal) -> str:
 
 # Lexical Mapping
 
-def decimalLexicalMap(LEX: str) -> _Decimal:
-	check_matches_production(decimalLexicalRep, LEX)
+@in_decimal_context
+def decimalLexicalMap(LEX: str, validate: bool = True) -> _Decimal:
+	if not spec_literal:
+		if validate:
+			check_matches_production(compiled_productions["decimalLexicalRep"], LEX)
 
-	m = re.fullmatch(decimalLexicalRep, LEX)
+		return _decimalValue(LEX)
 
-	if m.group(12) is not None:
+	m = match_production(compiled_productions["decimalLexicalRep"], LEX)
+
+	if m.group("point") is None:
 		d = decimal.Decimal(noDecimalMap(LEX))
 	else:
 		d = decimalPtMap(LEX)
 
-	return d.quantize(decimal.Decimal(10) ** -(len(m.group(7) if m.group(7) is not None else m.group(10) if m.group(10) is not None else "")))
+	return d.quantize(decimal.Decimal(10) ** -len(m.group("fraction") or ""))
 
 # Canonical Mapping
 
+@in_decimal_context
 def decimalCanonicalMap(d: _Decimal) -> str:
-	check_meets_condition(isinstance(d, decimal.Decimal), "a decimal value", d)
+	check_meets_condition(isinstance(d, decimal.Decimal) and d.is_finite(), "a decimal value", d)
 
 	if d == d.to_integral_value():
 		return noDecimalPtCanonicalMap(int(d))
 
 	return decimalPtCanonicalMap(d)
 
+# NOTE: These are not in the specification. They map between decimal literals and ScaledDecimal values exactly as
+#       'decimalLexicalMap' and 'decimalCanonicalMap' do with decimal.Decimal values, without any decimal context.
+
+def scaledDecimalLexicalMap(LEX: str) -> ScaledDecimal:
+	check_matches_production(compiled_productions["decimalLexicalRep"], LEX)
+
+	(integer, _, fraction) = LEX.partition(".")
+
+	# NOTE: 'int' reads the sign along with the digits.
+	return tuple.__new__(ScaledDecimal, (_integerValue(integer + fraction), len(fraction)))
+
+def scaledDecimalCanonicalMap(v: ScaledDecimal) -> str:
+	check_meets_condition(isinstance(v, ScaledDecimal) and isinstance(v.coefficient, int) and isinstance(v.scale, int) and v.scale >= 0, "a scaled decimal value", v)
+
+	(c, scale) = v._normalized()
+
+	if scale == 0:
+		return _integerNumeral(c)
+
+	digits = _integerNumeral(abs(c)).rjust(scale + 1, "0")
+
+	return ("-" if c < 0 else "") + digits[:-scale] + "." + digits[-scale:]
+
 # Lexical Mapping
 
-def floatLexicalMap(LEX: str) -> _Float:
-	m = re.fullmatch(floatRep, LEX)
+@in_decimal_context
+def floatLexicalMap(LEX: str, validate: bool = True) -> _Float:
+	if not (validate or spec_literal):
+		return specialRepValue(LEX) if LEX in _specialReps else _floatingPointNumeralValue(LEX, 24, -149, 104)
 
-	if m.group(36) is not None:
+	m = match_production(compiled_productions["floatRep"], LEX)
+
+	if m.group("special") is not None:
 		return specialRepValue(LEX)
 
-	if m.group(1) is not None:
-		nV = decimal.Decimal(noDecimalMap(LEX))
-	elif m.group(5) is not None:
-		nV = decimalPtMap(LEX)
+	if not spec_literal:
+		return _floatingPointLexicalValue(m, 24, -149, 104)
+
+	if m.group("exponent") is not None:
+		nV = scientificMap(LEX, validate=False)
+	elif m.group("point") is not None:
+		nV = decimalPtMap(LEX, validate=False)
 	else:
-		nV = scientificMap(LEX)
+		nV = decimal.Decimal(noDecimalMap(LEX, validate=False))
 
 	if nV != 0:
 		nV = _floatingPointRound(nV, 24, -149, 104)
@@ -626,18 +1300,26 @@ def floatLexicalMap(LEX: str) -> _Float:
 
 # Lexical Mapping
 
-def doubleLexicalMap(LEX: str) -> _Double:
-	m = re.fullmatch(doubleRep, LEX)
+@in_decimal_context
+def doubleLexicalMap(LEX: str, validate: bool = True) -> _Double:
+	if not (validate or spec_literal):
+		return specialRepValue(LEX) if LEX in _specialReps else decimal.Decimal(float(LEX))
+
+	m = match_production(compiled_productions["doubleRep"], LEX)
 
-	if m.group(36) is not None:
+	if m.group("special") is not None:
 		return specialRepValue(LEX)
 
-	if m.group(1) is not None:
-		nV = decimal.Decimal(noDecimalMap(LEX))
-	elif m.group(5) is not None:
-		nV = decimalPtMap(LEX)
+	# NOTE: CPython reads a numeral as the nearest binary64 value (ties to even), which is this mapping exactly.
+	if not spec_literal:
+		return decimal.Decimal(float(LEX))
+
+	if m.group("exponent") is not None:
+		nV = scientificMap(LEX, validate=False)
+	elif m.group("point") is not None:
+		nV = decimalPtMap(LEX, validate=False)
 	else:
-		nV = scientificMap(LEX)
+		nV = decimal.Decimal(noDecimalMap(LEX, validate=False))
 
 	if nV != 0:
 		nV = _floatingPointRound(nV, 53, -1074, 971)
@@ -649,7 +1331,10 @@ def doubleLexicalMap(LEX: str) -> _Double:
 
 # Canonical Mapping
 
+@in_decimal_context
 def floatCanonicalMap(f: _Float) -> str:
+	check_meets_condition(isinstance(f, decimal.Decimal), "a float value", f)
+
 	if math.isinf(f) or math.isnan(f):
 		return specialRepCanonicalMap(f)
 
@@ -659,6 +1344,15 @@ def floatCanonicalMap(f: _Float) -> str:
 	if f.number_class() == "-Zero":
 		return "-0.0E0"
 
+	if not spec_literal:
+		# NOTE: A value that is not already a float value is rounded to one first.
+		nV = _floatingPointRound(f, 24, -149, 104)
+
+		if nV.is_infinite():
+			return specialRepCanonicalMap(nV)
+
+		return scientificCanonicalMap(decimal.Decimal(_shortestFloatNumeral(nV)))
+
 	s = -1 if f < 0 else 1
 
 	f_tuple = f.normalize().as_tuple()
@@ -666,8 +1360,6 @@ def floatCanonicalMap(f: _Float) -> str:
 	c = int("".join(str(x) for x in f_tuple.digits))
 	e = f_tuple.exponent
 
-	print(f, s, c, e)
-
 	# XXX: When is 'l' not 0?
 	l = 0
 
@@ -676,7 +1368,10 @@ def floatCanonicalMap(f: _Float) -> str:
 
 # Canonical Mapping
 
+@in_decimal_context
 def doubleCanonicalMap(f: _Double) -> str:
+	check_meets_condition(isinstance(f, decimal.Decimal), "a double value", f)
+
 	if math.isinf(f) or math.isnan(f):
 		return specialRepCanonicalMap(f)
 
@@ -686,6 +1381,15 @@ def doubleCanonicalMap(f: _Double) -> str:
 	if f.number_class() == "-Zero":
 		return "-0.0E0"
 
+	if not spec_literal:
+		# NOTE: A value that is not already a double value is rounded to one first.
+		nV = _floatingPointRound(f, 53, -1074, 971)
+
+		if nV.is_infinite():
+			return specialRepCanonicalMap(nV)
+
+		return scientificCanonicalMap(decimal.Decimal(repr(float(nV))))
+
 	s = -1 if f < 0 else 1
 
 	f_tuple = f.normalize().as_tuple()
@@ -693,56 +1397,201 @@ def doubleCanonicalMap(f: _Double) -> str:
 	c = int("".join(str(x) for x in f_tuple.digits))
 	e = f_tuple.exponent
 
-	print(f, s, c, e)
-
 	# XXX: When is 'l' not 0?
 	l = 0
 
 	# XXX: This assumes that any intervening zero is insignificant. Is that what we want to happen?
 	return scientificCanonicalMap(s * _floatApprox(c, e, l))
 
+# Native Values
+
+# NOTE: These are not in the specification. They map float and double literals to native Python floats (binary64) rather
+#       than decimal.Decimal values, keeping signed zero, infinities and NaN. A float value is always exactly a binary64
+#       value, so nothing is lost. 'floatLexicalMap' and 'doubleLexicalMap' remain the reference mappings.
+
+_float32 = struct.Struct("f")
+
+def floatNativeLexicalMap(LEX: str, validate: bool = True) -> float:
+	if validate:
+		check_matches_production(compiled_productions["floatRep"], LEX)
+
+	return _float32Value(LEX)
+
+# NOTE: This must be called with a literal matching 'floatRep'.
+def _float32Value(LEX: str) -> float:
+	x = float(LEX)
+
+	try:
+		y = _float32.unpack(_float32.pack(x))[0]  # type: float
+	except OverflowError:
+		return float(floatLexicalMap(LEX))
+
+	# NOTE: Narrowing through binary64 rounds twice, which only goes wrong when 'x' lies exactly halfway between 'y' and
+	#       the next float value 'z'. Those literals are mapped exactly instead.
+	if y != x and math.isfinite(x):
+		z = 2 * x - y
+
+		if _float32.unpack(_float32.pack(z))[0] == z:
+			return float(floatLexicalMap(LEX))
+
+	return y
+
+def doubleNativeLexicalMap(LEX: str, validate: bool = True) -> float:
+	if validate:
+		check_matches_production(compiled_productions["doubleRep"], LEX)
+
+	return float(LEX)
+
+# NOTE: As in '_shortestFloatNumeral', the number of significant digits is bisected, here checking each numeral natively.
+def floatNativeCanonicalMap(f: float) -> str:
+	check_meets_condition(isinstance(f, float), "a native float value", f)
+
+	if math.isinf(f) or math.isnan(f) or f == 0 or _float32.unpack(_float32.pack(f))[0] != f:
+		return floatCanonicalMap(decimal.Decimal(f))
+
+	(lo, hi) = (1, 9)
+
+	while lo < hi:
+		p = (lo + hi) // 2
+
+		if _float32Value("{:.{}e}".format(f, p - 1)) == f:
+			hi = p
+		else:
+			lo = p + 1
+
+	return scientificCanonicalMap(decimal.Decimal("{:.{}e}".format(f, lo - 1)))
+
+def doubleNativeCanonicalMap(f: float) -> str:
+	check_meets_condition(isinstance(f, float), "a native double value", f)
+
+	if math.isinf(f) or math.isnan(f) or f == 0:
+		return doubleCanonicalMap(decimal.Decimal(f))
+
+	return scientificCanonicalMap(decimal.Decimal(repr(f)))
+
+# Bulk Lexical Mapping
+
+# NOTE: These are not in the specification. They map many literals at once to NumPy arrays of native IEEE 754 values,
+#       along with a mask of which literals are in the lexical space. Literals that are not map to NaN.
+#       'floatLexicalMap' and 'doubleLexicalMap' remain the reference mappings.
+
+def _floatingPointArray(literals: typing.Iterable[str], production: str, exact: typing.Callable[[str], decimal.Decimal], dtype: str) -> typing.Tuple[typing.Any, typing.Any]:
+	if numpy is None:
+		raise ImportError("NumPy is required for bulk floating-point mappings")
+
+	fullmatch = compiled_productions[production].fullmatch
+
+	literals = list(literals)
+	mask = numpy.array([isinstance(LEX, str) and fullmatch(LEX) is not None for LEX in literals], dtype=bool)
+
+	# NOTE: Once a literal is known to be in the lexical space, 'float' reads it exactly as XSD does, including
+	#       "INF", "+INF", "-INF", "NaN", and signed zero.
+	values = numpy.array([float(LEX) if valid else math.nan for (LEX, valid) in zip(literals, mask)], dtype=numpy.float64)
+
+	if dtype == "float64":
+		return (values, mask)
+
+	with numpy.errstate(over="ignore"):
+		narrowed = values.astype(dtype)
+
+		# NOTE: Going through binary64 rounds twice, which can only go wrong where the binary64 value lies on (or next to)
+		#       a tie between two values of 'dtype'. Those are the values whose neighbours narrow differently, and they
+		#       are mapped exactly instead.
+		below = numpy.nextafter(values, -math.inf).astype(dtype)
+		above = numpy.nextafter(values, math.inf).astype(dtype)
+
+	for i in numpy.flatnonzero(mask & numpy.isfinite(values) & (below != above)):
+		narrowed[i] = float(exact(literals[i]))
+
+	return (narrowed, mask)
+
+def floatLexicalMapArray(literals: typing.Iterable[str]) -> typing.Tuple[typing.Any, typing.Any]:
+	return _floatingPointArray(literals, "floatRep", floatLexicalMap, "float32")
+
+def doubleLexicalMapArray(literals: typing.Iterable[str]) -> typing.Tuple[typing.Any, typing.Any]:
+	return _floatingPointArray(literals, "doubleRep", doubleLexicalMap, "float64")
+
 #
 
-def durationMap(DUR: str) -> _Duration:
-	m = re.fullmatch(durationLexicalRep, DUR)
+# NOTE: Computes the months and seconds of a scanned duration with the same arithmetic as the fragment mappings.
+def _scannedDurationValue(sign: int, numerals: typing.List[typing.Optional[str]]) -> _Duration:
+	(Y, M, D, H, MI, S) = numerals
+
+	if Y is None and M is None:
+		months = 0
+	else:
+		months = sign * (12 * (_integerValue(Y) if Y is not None else 0) + (_integerValue(M) if M is not None else 0))
+
+	if D is None and H is None and MI is None and S is None:
+		return DurationValue(months, decimal.Decimal(0))
+
+	if H is None and MI is None and S is None:
+		t = decimal.Decimal(0)
+	else:
+		s = decimal.Decimal(0) if S is None else decimalPtMap(S, validate=False) if "." in S else decimal.Decimal(_integerValue(S))
+		t = decimal.Decimal(3600 * (_integerValue(H) if H is not None else 0) + 60 * (_integerValue(MI) if MI is not None else 0) + s)
+
+	return DurationValue(months, sign * decimal.Decimal(86400 * (_integerValue(D) if D is not None else 0) + t))
+
+# NOTE: Literals the scanner rejects fall through to the spec's mapping, which raises the usual TypeError. The scanner
+#       checks the literal as it maps it, so there is no separate check for 'validate' to skip.
+@in_decimal_context
+def durationMap(DUR: str, validate: bool = True) -> _Duration:
+	scanned = _scanDuration(DUR, 0, 6) if not spec_literal and isinstance(DUR, str) else None
+
+	if scanned is not None:
+		return _scannedDurationValue(*scanned)
+
+	m = match_production(compiled_productions["durationLexicalRep"], DUR)
 
 	# NOTE: The spec doesn't use a capture group for the sign.
 	sign = -1 if DUR[0] == "-" else 1
 
-	months = sign * _duYearMonthFragmentMap(m.group(3)) if m.group(3) is not None else 0
-	seconds = sign * _duDayTimeFragmentMap(m.group(14)) if m.group(14) is not None else sign * _duDayTimeFragmentMap(m.group(123)) if m.group(123) is not None else decimal.Decimal(0)
+	months = sign * _duYearMonthFragmentMap(m.group("yearMonth")) if m.group("yearMonth") else 0
+	seconds = sign * _duDayTimeFragmentMap(m.group("dayTime")) if m.group("dayTime") else decimal.Decimal(0)
 
-	return { "months": months, "seconds": seconds }
+	return DurationValue(months, seconds)
 
+@in_decimal_context
 def yearMonthDurationMap(YM: str) -> _YearMonthDuration:
-	m = re.fullmatch(yearMonthDurationLexicalRep, YM)
+	scanned = _scanDuration(YM, 0, 2) if not spec_literal and isinstance(YM, str) else None
+
+	if scanned is not None:
+		return _scannedDurationValue(*scanned)
+
+	m = match_production(compiled_productions["yearMonthDurationLexicalRep"], YM)
 
 	# NOTE: The spec doesn't use a capture group for the sign.
 	sign = -1 if YM[0] == "-" else 1
 
-	months = sign * _duYearMonthFragmentMap(m.group(1))
+	months = sign * _duYearMonthFragmentMap(m.group("yearMonth"))
 	seconds = decimal.Decimal(0)
 
-	return { "months": months, "seconds": seconds }
+	return DurationValue(months, seconds)
 
 # BUG: The spec says "a dayTimeDuration value" when it means "matches dayTimeDurationLexicalRep".
+@in_decimal_context
 def dayTimeDurationMap(DT: str) -> _DayTimeDuration:
-	m = re.fullmatch(dayTimeDurationLexicalRep, DT)
+	scanned = _scanDuration(DT, 2, 6) if not spec_literal and isinstance(DT, str) else None
+
+	if scanned is not None:
+		return _scannedDurationValue(*scanned)
+
+	m = match_production(compiled_productions["dayTimeDurationLexicalRep"], DT)
 
 	# NOTE: The spec doesn't use a capture group for the sign.
 	sign = -1 if DT[0] == "-" else 1
 
-	print(m.re)
-	print(list(enumerate(m.groups(), start=1)))
-
 	months = 0
-	seconds = sign * _duDayTimeFragmentMap(m.group(1))
+	seconds = sign * _duDayTimeFragmentMap(m.group("dayTime"))
 
-	return { "months": months, "seconds": seconds }
+	return DurationValue(months, seconds)
 
+@in_decimal_context
 def durationCanonicalMap(v: _Duration) -> str:
-	m = v["months"]
-	s = v["seconds"]
+	check_meets_condition(isinstance(v, DurationValue), "a duration value", v)
+
+	(m, s) = v
 	sgn = "-" if m < 0 or s < 0 else ""
 
 	if m != 0 and s != 0:
@@ -758,14 +1607,40 @@ def durationCanonicalMap(v: _Duration) -> str:
 # [...]
 
 
+def _isASCIIEncodable(S: str) -> bool:
+	try:
+		S.encode("ascii")
+	except UnicodeEncodeError:
+		return False
+
+	return True
+
+# NOTE: 'str.isascii' is new in Python 3.7.
+_isASCII = getattr(str, "isascii", _isASCIIEncodable)  # type: typing.Callable[[str], bool]
+
+# NOTE: The only ASCII character outside 'stringRep' is U+0000, and 'in' finds it far faster than the regular expression
+#       can match the rest. Other strings are matched as usual.
+def _inStringRep(S: str) -> bool:
+	if isinstance(S, str) and _isASCII(S):
+		return "\x00" not in S
+
+	return compiled_productions["stringRep"].fullmatch(S) is not None
+
+# NOTE: A string is in the lexical space exactly when each of its fragments is, since 'stringRep' is a repetition of
+#       single characters (and joining strings never pairs up surrogates), so the fragments never have to be joined.
+def _inStringRepChunks(fragments: typing.Iterable[str]) -> bool:
+	return all(_inStringRep(S) for S in fragments)
+
 # XSD 1.1, Part 2: E.4 Lexical and Canonical Mappings for Other Datatypes
-def stringLexicalMap(LEX: str) -> _String:
-	check_matches_production(stringRep, LEX)
+def stringLexicalMap(LEX: str, validate: bool = True) -> _String:
+	if validate and not _inStringRep(LEX):
+		check_matches_production(compiled_productions["stringRep"], LEX)
 
 	return LEX
 
-def booleanLexicalMap(LEX: str) -> _Boolean:
-	check_matches_production(booleanRep, LEX)
+def booleanLexicalMap(LEX: str, validate: bool = True) -> _Boolean:
+	if validate:
+		check_matches_production(compiled_productions["booleanRep"], LEX)
 
 	return True if LEX in { "true", "1" } else False
 
@@ -783,7 +1658,153 @@ def booleanCanonicalMap(b: _Boolean) -> str:
 ###
 
 
+MappingCacheInfo = collections.namedtuple("MappingCacheInfo", ["hits", "misses", "evictions", "size", "maxsize"])
+
+# NOTE: This is an opt-in, size-bounded cache in front of a datatype's lexical or canonical mapping.
+#       It evicts either the least recently used entry ("lru") or the oldest entry ("fifo").
+class MappingCache:
+	def __init__(self, maxsize: int, eviction: str = "lru") -> None:
+		check_meets_condition(isinstance(maxsize, int) and maxsize > 0, "a positive integer", maxsize)
+		check_meets_condition(eviction in { "lru", "fifo" }, "one of { 'lru', 'fifo' }", eviction)
+
+		self.maxsize = maxsize
+		self.eviction = eviction
+
+		self._entries = collections.OrderedDict()  # type: typing.MutableMapping[typing.Hashable, typing.Any]
+		self._lock = threading.Lock()
+
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+
+	def __repr__(self) -> str:
+		return "{}({}, {})".format(self.__class__.__name__, repr(self.maxsize), repr(self.eviction))
+
+	def lookup(self, key: typing.Hashable, mapping: typing.Callable[[], typing.Any]) -> typing.Any:
+		with self._lock:
+			if key in self._entries:
+				self.hits += 1
+
+				if self.eviction == "lru":
+					self._entries.move_to_end(key)  # type: ignore
+
+				return self._unshared(self._entries[key])
+
+			self.misses += 1
+
+		# NOTE: Mappings that raise are not cached.
+		value = mapping()
+
+		with self._lock:
+			self._entries[key] = value
+
+			while len(self._entries) > self.maxsize:
+				self._entries.popitem(last=False)  # type: ignore
+				self.evictions += 1
+
+		return self._unshared(value)
+
+	def info(self) -> MappingCacheInfo:
+		with self._lock:
+			return MappingCacheInfo(self.hits, self.misses, self.evictions, len(self._entries), self.maxsize)
+
+	def clear(self) -> None:
+		with self._lock:
+			self._entries.clear()
+
+			self.hits = 0
+			self.misses = 0
+			self.evictions = 0
+
+	# NOTE: Mutable values are copied so that no caller can alter a cached value.
+	@staticmethod
+	def _unshared(value: typing.Any) -> typing.Any:
+		if isinstance(value, (str, bool, int, float, decimal.Decimal, DurationValue)):
+			return value
+
+		return copy.copy(value)
+
+# NOTE: Values are keyed on their representation, so that equal values with different representations
+#       (e.g. 0 and -0 for xs:float) do not share a canonical representation.
+def mapping_cache_key(x: typing.Any) -> typing.Hashable:
+	return x if isinstance(x, str) else (type(x), repr(x))
+
+def cached_mapping(mapping: typing.Callable[[typing.Any, typing.Any], typing.Any]) -> typing.Callable[[typing.Any, typing.Any], typing.Any]:
+	cache_name = "_{}_cache".format(mapping.__name__)
+
+	@functools.wraps(mapping)
+	def cached(cls: typing.Any, x: typing.Any) -> typing.Any:
+		# NOTE: A cache belongs to the class it was enabled on, not to its subclasses.
+		cache = cls.__dict__.get(cache_name)
+
+		if cache is None:
+			return mapping(cls, x)
+
+		return cache.lookup(mapping_cache_key(x), lambda: mapping(cls, x))
+
+	return cached
+
+
+BatchResults = collections.namedtuple("BatchResults", ["results", "errors"])
+
+# NOTE: The 'try_' methods of a datatype return this instead of raising. It is falsy, but so are some values (e.g. False),
+#       so test for it with 'isinstance'. Its message is only formatted when asked for.
+class InvalidLiteral:
+	__slots__ = ("datatype", "literal")
+
+	def __init__(self, datatype: typing.Type["Datatype"], literal: typing.Any) -> None:
+		self.datatype = datatype
+		self.literal = literal
+
+	def __repr__(self) -> str:
+		return "{}({}, {})".format(self.__class__.__name__, self.datatype.__name__, repr(self.literal))
+
+	def __bool__(self) -> bool:
+		return False
+
+	@property
+	def message(self) -> str:
+		return "Literal not in lexical space: {}".format(self.literal)
+
+_byteStrings = (bytes, bytearray, memoryview)
+
+def _decodedLiteral(b: typing.Union[bytes, bytearray, memoryview]) -> str:
+	check_meets_condition(isinstance(b, _byteStrings), "a byte string", b)
+
+	try:
+		return str(b, "utf-8")
+	except UnicodeDecodeError:
+		raise TypeError("Not a UTF-8 byte string: {!r}".format(bytes(b))) from None
+
+
+###
+
+
 class Datatype(metaclass=abc.ABCMeta):
+	# NOTE: The value and canonical representation are mapped on first use and kept until the literal changes.
+	__slots__ = ("_lexical_representation", "_value", "_canonical_representation")
+
+	_lexical_mapping_cache = None  # type: typing.Optional[MappingCache]
+	_canonical_mapping_cache = None  # type: typing.Optional[MappingCache]
+
+	# NOTE: Subclasses set these so that the batch mappings can go straight to the compiled production and mapping functions.
+	#       A lexical mapping function also takes 'validate', to skip its check of a literal already in the lexical space.
+	_lexical_rep = None  # type: typing.Optional[typing.Pattern[str]]
+	_lexical_rep_bytes = None  # type: typing.Optional[typing.Pattern[bytes]]
+	_lexical_map = None  # type: typing.Optional[typing.Callable[..., typing.Any]]
+	_canonical_map = None  # type: typing.Optional[typing.Callable[[typing.Any], str]]
+
+	# NOTE: A subclass that overrides 'lexical_mapping' or 'canonical_mapping' without also setting the matching mapping
+	#       function drops the inherited one, so that 'parse' and 'format' call the override.
+	def __init_subclass__(cls, **kwargs: typing.Any) -> None:
+		super().__init_subclass__(**kwargs)
+
+		if "lexical_mapping" in cls.__dict__ and "_lexical_map" not in cls.__dict__:
+			cls._lexical_map = None
+
+		if "canonical_mapping" in cls.__dict__ and "_canonical_map" not in cls.__dict__:
+			cls._canonical_map = None
+
 	def __init__(self, literal: str) -> None:
 		self.lexical_representation = literal
 
@@ -800,14 +1821,22 @@ class Datatype(metaclass=abc.ABCMeta):
 			raise TypeError("Literal not in lexical space: {}".format(literal))
 
 		self._lexical_representation = literal
+		self._value = None  # type: typing.Any
+		self._canonical_representation = None  # type: typing.Optional[str]
 
 	@property
 	def value(self) -> typing.Any:
-		return self.lexical_mapping(self.lexical_representation)
+		if self._value is None:
+			self._value = self.parse(self.lexical_representation)
+
+		return self._value
 
 	@property
 	def canonical_representation(self) -> str:
-		return self.canonical_mapping(self.value)
+		if self._canonical_representation is None:
+			self._canonical_representation = self.format(self.value)
+
+		return self._canonical_representation
 
 	@classmethod
 	@abc.abstractmethod
@@ -824,17 +1853,156 @@ class Datatype(metaclass=abc.ABCMeta):
 	def canonical_mapping(cls, value: typing.Any) -> str:
 		raise NotImplementedError
 
+	@classmethod
+	def try_parse(cls, literal: str) -> typing.Union["Datatype", InvalidLiteral]:
+		if not (isinstance(literal, str) and cls.in_lexical_space(literal)):
+			return InvalidLiteral(cls, literal)
+
+		# NOTE: The literal has just been checked, so the setter's check is skipped.
+		instance = cls.__new__(cls)
+		instance._lexical_representation = literal
+		instance._value = None
+		instance._canonical_representation = None
+
+		return instance
+
+	# NOTE: Byte strings are read as UTF-8. Where the lexical space is ASCII they are checked in place, without decoding.
+	@classmethod
+	def in_lexical_space_bytes(cls, literal: typing.Any) -> bool:
+		if not isinstance(literal, _byteStrings):
+			return False
+
+		if cls._lexical_rep_bytes is not None:
+			return cls._lexical_rep_bytes.fullmatch(literal) is not None
+
+		try:
+			return cls.in_lexical_space(str(literal, "utf-8"))
+		except UnicodeDecodeError:
+			return False
+
+	@classmethod
+	def in_lexical_space_bytes_many(cls, literals: typing.Iterable[typing.Union[bytes, bytearray, memoryview]]) -> typing.List[bool]:
+		if cls._lexical_rep_bytes is None:
+			return [cls.in_lexical_space_bytes(literal) for literal in literals]
+
+		fullmatch = cls._lexical_rep_bytes.fullmatch
+
+		return [isinstance(literal, _byteStrings) and fullmatch(literal) is not None for literal in literals]
+
+	@classmethod
+	def lexical_mapping_bytes(cls, literal: typing.Union[bytes, bytearray, memoryview]) -> typing.Any:
+		return cls.parse(_decodedLiteral(literal))
+
+	# NOTE: The literal is checked once, here, and the mapping function skips its own check. Whatever the mapping raises
+	#       for a literal in the lexical space is not a bad literal, so it is not caught.
+	@classmethod
+	def try_lexical_mapping(cls, literal: typing.Any) -> typing.Any:
+		if not (isinstance(literal, str) and cls.in_lexical_space(literal)):
+			return InvalidLiteral(cls, literal)
+
+		lexical_map = cls._lexical_map
+
+		if lexical_map is None:
+			return cls.parse(literal)
+
+		cache = cls.__dict__.get("_lexical_mapping_cache")
+
+		if cache is None:
+			return lexical_map(literal, False)
+
+		return cache.lookup(mapping_cache_key(literal), functools.partial(lexical_map, literal, False))
+
+	# NOTE: These go straight to the mapping functions (through the caches, if enabled), whose own check of the input
+	#       is the only one made, and create no instance. They raise as the mapping functions do.
+	@classmethod
+	def parse(cls, literal: str) -> typing.Any:
+		return cls._mapping(cls._lexical_map or cls.lexical_mapping, cls.__dict__.get("_lexical_mapping_cache"), literal)
+
+	@classmethod
+	def format(cls, value: typing.Any) -> str:
+		literal = cls._mapping(cls._canonical_map or cls.canonical_mapping, cls.__dict__.get("_canonical_mapping_cache"), value)  # type: str
+
+		return literal
+
+	@classmethod
+	def in_lexical_space_many(cls, literals: typing.Iterable[str]) -> typing.List[bool]:
+		if cls._lexical_rep is None:
+			return [cls.in_lexical_space(literal) for literal in literals]
+
+		fullmatch = cls._lexical_rep.fullmatch
+
+		return [isinstance(literal, str) and fullmatch(literal) is not None for literal in literals]
+
+	@classmethod
+	def lexical_mapping_many(cls, literals: typing.Iterable[str]) -> BatchResults:
+		return cls._mapping_many(cls._lexical_map or cls.lexical_mapping, cls.__dict__.get("_lexical_mapping_cache"), literals)
+
+	@classmethod
+	def canonical_mapping_many(cls, values: typing.Iterable[typing.Any]) -> BatchResults:
+		return cls._mapping_many(cls._canonical_map or cls.canonical_mapping, cls.__dict__.get("_canonical_mapping_cache"), values)
+
+	@staticmethod
+	def _mapping(mapping: typing.Callable[[typing.Any], typing.Any], cache: typing.Optional[MappingCache], x: typing.Any) -> typing.Any:
+		if cache is None:
+			return mapping(x)
+
+		return cache.lookup(mapping_cache_key(x), functools.partial(mapping, x))
+
+	# NOTE: Each failure leaves None in 'results' and adds an (index, exception) pair to 'errors'.
+	@staticmethod
+	def _mapping_many(mapping: typing.Callable[[typing.Any], typing.Any], cache: typing.Optional[MappingCache], items: typing.Iterable[typing.Any]) -> BatchResults:
+		results = []  # type: typing.List[typing.Any]
+		errors = []  # type: typing.List[typing.Tuple[int, Exception]]
+
+		for (i, x) in enumerate(items):
+			try:
+				if cache is None:
+					results.append(mapping(x))
+				else:
+					results.append(cache.lookup(mapping_cache_key(x), functools.partial(mapping, x)))
+			except (AssertionError, TypeError, ValueError, ArithmeticError) as e:
+				results.append(None)
+				errors.append((i, e))
+
+		return BatchResults(results, errors)
+
+	# NOTE: Swapping the mappings of a class empties its caches, which hold values from the old mappings.
+	@classmethod
+	def _use_mappings(cls, lexical_map: typing.Callable[..., typing.Any], canonical_map: typing.Callable[[typing.Any], str]) -> None:
+		cls._lexical_map = staticmethod(lexical_map)
+		cls._canonical_map = staticmethod(canonical_map)
+
+		for cache in [cls.__dict__.get("_lexical_mapping_cache"), cls.__dict__.get("_canonical_mapping_cache")]:
+			if cache is not None:
+				cache.clear()
+
+	@classmethod
+	def enable_mapping_cache(cls, maxsize: int = 1024, eviction: str = "lru") -> None:
+		cls._lexical_mapping_cache = MappingCache(maxsize, eviction)
+		cls._canonical_mapping_cache = MappingCache(maxsize, eviction)
+
+	@classmethod
+	def disable_mapping_cache(cls) -> None:
+		cls._lexical_mapping_cache = None
+		cls._canonical_mapping_cache = None
+
+	@classmethod
+	def mapping_cache_info(cls) -> typing.Dict[str, MappingCacheInfo]:
+		caches = { "lexical_mapping": cls.__dict__.get("_lexical_mapping_cache"), "canonical_mapping": cls.__dict__.get("_canonical_mapping_cache") }
+
+		return { name: cache.info() for (name, cache) in caches.items() if cache is not None }
+
 
 class SpecialDatatype(Datatype):
-	pass
+	__slots__ = ()
 
 
 class PrimitiveDatatype(Datatype):
-	pass
+	__slots__ = ()
 
 
 class OrdinaryDatatype(Datatype):
-	pass
+	__slots__ = ()
 
 
 ###
@@ -842,101 +2010,190 @@ class OrdinaryDatatype(Datatype):
 
 # XSD 1.1, Part 2: 3.3.1 string
 class String(PrimitiveDatatype):
+	__slots__ = ()
+
+	_lexical_rep = compiled_productions["stringRep"]
+	_lexical_map = staticmethod(stringLexicalMap)
+	_canonical_map = staticmethod(stringCanonicalMap)
+
 	@classmethod
 	def in_lexical_space(cls, literal: str) -> bool:
-		return bool(re.fullmatch(stringRep, literal))
+		return _inStringRep(literal)
+
+	@classmethod
+	def in_lexical_space_chunked(cls, fragments: typing.Iterable[str]) -> bool:
+		return _inStringRepChunks(fragments)
 
 	@classmethod
+	def in_lexical_space_many(cls, literals: typing.Iterable[str]) -> typing.List[bool]:
+		return [isinstance(literal, str) and _inStringRep(literal) for literal in literals]
+
+	@classmethod
+	@cached_mapping
 	def lexical_mapping(cls, lexical_representation: str) -> _String:
 		assert cls.in_lexical_space(lexical_representation)
 
 		return stringLexicalMap(lexical_representation)
 
 	@classmethod
+	@cached_mapping
 	def canonical_mapping(cls, value: _String) -> str:
 		return stringCanonicalMap(value)
 
 
 # XSD 1.1, Part 2: 3.3.2 boolean
 class Boolean(PrimitiveDatatype):
+	__slots__ = ()
+
+	_lexical_rep = compiled_productions["booleanRep"]
+	_lexical_rep_bytes = compiled_byte_productions["booleanRep"]
+	_lexical_map = staticmethod(booleanLexicalMap)
+	_canonical_map = staticmethod(booleanCanonicalMap)
+
 	@classmethod
 	def in_lexical_space(cls, literal: str) -> bool:
-		return bool(re.fullmatch(booleanRep, literal))
+		return bool(compiled_productions["booleanRep"].fullmatch(literal))
 
 	@classmethod
+	@cached_mapping
 	def lexical_mapping(cls, lexical_representation: str) -> _Boolean:
 		assert cls.in_lexical_space(lexical_representation)
 
 		return booleanLexicalMap(lexical_representation)
 
 	@classmethod
+	@cached_mapping
 	def canonical_mapping(cls, value: _Boolean) -> str:
 		return booleanCanonicalMap(value)
 
 
 # XSD 1.1, Part 2: 3.3.3 decimal
 class Decimal(PrimitiveDatatype):
+	__slots__ = ()
+
+	_lexical_rep = compiled_productions["decimalLexicalRep"]
+	_lexical_rep_bytes = compiled_byte_productions["decimalLexicalRep"]
+	_lexical_map = staticmethod(decimalLexicalMap)
+	_canonical_map = staticmethod(decimalCanonicalMap)
+
 	@classmethod
 	def in_lexical_space(cls, literal: str) -> bool:
-		return bool(re.fullmatch(decimalLexicalRep, literal))
+		return bool(compiled_productions["decimalLexicalRep"].fullmatch(literal))
 
 	@classmethod
+	@cached_mapping
 	def lexical_mapping(cls, lexical_representation: str) -> _Decimal:
 		assert cls.in_lexical_space(lexical_representation)
 
 		return decimalLexicalMap(lexical_representation)
 
 	@classmethod
+	@cached_mapping
 	def canonical_mapping(cls, value: _Decimal) -> str:
 		return decimalCanonicalMap(value)
 
 
 # XSD 1.1, Part 2: 3.3.4 float
 class Float(PrimitiveDatatype):
+	__slots__ = ()
+
+	_lexical_rep = compiled_productions["floatRep"]
+	_lexical_rep_bytes = compiled_byte_productions["floatRep"]
+	_lexical_map = staticmethod(floatLexicalMap)
+	_canonical_map = staticmethod(floatCanonicalMap)  # type: typing.Callable[[typing.Any], str]
+
 	@classmethod
 	def in_lexical_space(cls, literal: str) -> bool:
-		return bool(re.fullmatch(floatRep, literal))
+		return bool(compiled_productions["floatRep"].fullmatch(literal))
+
+	# NOTE: In native mode, values are Python floats instead of decimal.Decimal values. Switching empties the mapping
+	#       caches, but instances keep the value they have already mapped, so switch before creating any.
+	@classmethod
+	def enable_native_values(cls) -> None:
+		cls._use_mappings(floatNativeLexicalMap, floatNativeCanonicalMap)
+
+	@classmethod
+	def disable_native_values(cls) -> None:
+		cls._use_mappings(floatLexicalMap, floatCanonicalMap)
 
 	@classmethod
-	def lexical_mapping(cls, lexical_representation: str) -> _Float:
+	@cached_mapping
+	def lexical_mapping(cls, lexical_representation: str) -> typing.Union[_Float, float]:
 		assert cls.in_lexical_space(lexical_representation)
 
-		return floatLexicalMap(lexical_representation)
+		return cls._lexical_map(lexical_representation)
 
 	@classmethod
-	def canonical_mapping(cls, value: _Float) -> str:
-		return floatCanonicalMap(value)
+	@cached_mapping
+	def canonical_mapping(cls, value: typing.Union[_Float, float]) -> str:
+		return cls._canonical_map(value)
+
+	@classmethod
+	def lexical_mapping_array(cls, literals: typing.Iterable[str]) -> typing.Tuple[typing.Any, typing.Any]:
+		return floatLexicalMapArray(literals)
 
 
 # XSD 1.1, Part 2: 3.3.5 double
 class Double(PrimitiveDatatype):
+	__slots__ = ()
+
+	_lexical_rep = compiled_productions["doubleRep"]
+	_lexical_rep_bytes = compiled_byte_productions["doubleRep"]
+	_lexical_map = staticmethod(doubleLexicalMap)
+	_canonical_map = staticmethod(doubleCanonicalMap)  # type: typing.Callable[[typing.Any], str]
+
 	@classmethod
 	def in_lexical_space(cls, literal: str) -> bool:
-		return bool(re.fullmatch(floatRep, literal))
+		return bool(compiled_productions["doubleRep"].fullmatch(literal))
+
+	# NOTE: In native mode, values are Python floats instead of decimal.Decimal values. Switching empties the mapping
+	#       caches, but instances keep the value they have already mapped, so switch before creating any.
+	@classmethod
+	def enable_native_values(cls) -> None:
+		cls._use_mappings(doubleNativeLexicalMap, doubleNativeCanonicalMap)
 
 	@classmethod
-	def lexical_mapping(cls, lexical_representation: str) -> _Double:
+	def disable_native_values(cls) -> None:
+		cls._use_mappings(doubleLexicalMap, doubleCanonicalMap)
+
+	@classmethod
+	@cached_mapping
+	def lexical_mapping(cls, lexical_representation: str) -> typing.Union[_Double, float]:
 		assert cls.in_lexical_space(lexical_representation)
 
-		return doubleLexicalMap(lexical_representation)
+		return cls._lexical_map(lexical_representation)
+
+	@classmethod
+	@cached_mapping
+	def canonical_mapping(cls, value: typing.Union[_Double, float]) -> str:
+		return cls._canonical_map(value)
 
 	@classmethod
-	def canonical_mapping(cls, value: _Double) -> str:
-		return doubleCanonicalMap(value)
+	def lexical_mapping_array(cls, literals: typing.Iterable[str]) -> typing.Tuple[typing.Any, typing.Any]:
+		return doubleLexicalMapArray(literals)
 
 # XSD 1.1, Part 2: 3.3.6 duration
 class Duration(PrimitiveDatatype):
+	__slots__ = ()
+
+	_lexical_rep = compiled_productions["durationLexicalRep"]
+	_lexical_rep_bytes = compiled_byte_productions["durationLexicalRep"]
+	_lexical_map = staticmethod(durationMap)
+	_canonical_map = staticmethod(durationCanonicalMap)
+
 	@classmethod
 	def in_lexical_space(cls, literal: str) -> bool:
-		return bool(re.fullmatch(durationLexicalRep, literal))
+		return bool(compiled_productions["durationLexicalRep"].fullmatch(literal))
 
 	@classmethod
+	@cached_mapping
 	def lexical_mapping(cls, lexical_representation: str) -> _Duration:
 		assert cls.in_lexical_space(lexical_representation)
 
 		return durationMap(lexical_representation)
 
 	@classmethod
+	@cached_mapping
 	def canonical_mapping(cls, value: _Duration) -> str:
 		return durationCanonicalMap(value)
 
@@ -0,0 +1,750 @@
+#!/usr/bin/env python3
+
+import bisect
+import collections
+import functools
+import itertools
+import re
+import threading
+import typing
+import unicodedata
+
+
+###
+
+
+# XSD 1.1, Part 2: G Regular Expressions
+# NOTE: A regular expression is parsed into these nodes. Every kind of character class becomes a set of code points,
+#       held as sorted, disjoint, non-adjacent (first, last) ranges. An unbounded repetition has a maximum of None.
+CharClass = collections.namedtuple("CharClass", ["ranges"])
+Sequence = collections.namedtuple("Sequence", ["pieces"])
+Alternation = collections.namedtuple("Alternation", ["branches"])
+Repetition = collections.namedtuple("Repetition", ["atom", "minimum", "maximum"])
+
+_Ranges = typing.Tuple[typing.Tuple[int, int], ...]
+_Node = typing.Union[CharClass, Sequence, Alternation, Repetition]
+
+_maxCodePoint = 0x10FFFF
+
+
+###
+
+
+def _normalizedRanges(ranges: typing.Iterable[typing.Tuple[int, int]]) -> _Ranges:
+	merged = []  # type: typing.List[typing.Tuple[int, int]]
+
+	for (first, last) in sorted(ranges):
+		if merged and first <= merged[-1][1] + 1:
+			merged[-1] = (merged[-1][0], max(merged[-1][1], last))
+		else:
+			merged.append((first, last))
+
+	return tuple(merged)
+
+def _complementRanges(ranges: _Ranges) -> _Ranges:
+	complement = []
+	next_first = 0
+
+	for (first, last) in ranges:
+		if first > next_first:
+			complement.append((next_first, first - 1))
+
+		next_first = last + 1
+
+	if next_first <= _maxCodePoint:
+		complement.append((next_first, _maxCodePoint))
+
+	return tuple(complement)
+
+def _differenceRanges(ranges: _Ranges, subtracted: _Ranges) -> _Ranges:
+	return _complementRanges(_normalizedRanges(_complementRanges(ranges) + subtracted))
+
+
+###
+
+
+# XSD 1.1, Part 2: G.4.2.2 Category Escapes
+_categories = {
+	"L", "Lu", "Ll", "Lt", "Lm", "Lo",
+	"M", "Mn", "Mc", "Me",
+	"N", "Nd", "Nl", "No",
+	"P", "Pc", "Pd", "Ps", "Pe", "Pi", "Pf", "Po",
+	"Z", "Zs", "Zl", "Zp",
+	"S", "Sm", "Sc", "Sk", "So",
+	"C", "Cc", "Cf", "Co", "Cn",
+}
+
+# NOTE: This reads the general category of every code point once, on first use, from the Unicode database that Python
+#       was built with.
+@functools.lru_cache(maxsize=None)
+def _generalCategoryRanges() -> typing.Dict[str, _Ranges]:
+	ranges = collections.defaultdict(list)  # type: typing.DefaultDict[str, typing.List[typing.Tuple[int, int]]]
+	first = 0
+
+	for (category, code_points) in itertools.groupby(map(unicodedata.category, map(chr, range(_maxCodePoint + 1)))):
+		last = first + sum(1 for _ in code_points) - 1
+		ranges[category].append((first, last))
+		first = last + 1
+
+	return { category: tuple(r) for (category, r) in ranges.items() }
+
+@functools.lru_cache(maxsize=None)
+def _categoryRanges(category: str) -> _Ranges:
+	table = _generalCategoryRanges()
+
+	if len(category) == 1:
+		return _normalizedRanges(itertools.chain.from_iterable(r for (c, r) in table.items() if c[0] == category))
+
+	return table.get(category, ())
+
+# XSD 1.1, Part 2: G.4.2.3 Block Escapes
+# NOTE: These are the blocks of Unicode 3.1, as listed for XSD 1.0, with spaces removed from their names.
+_blocks = {
+	"BasicLatin": ((0x0000, 0x007F),),
+	"Latin-1Supplement": ((0x0080, 0x00FF),),
+	"LatinExtended-A": ((0x0100, 0x017F),),
+	"LatinExtended-B": ((0x0180, 0x024F),),
+	"IPAExtensions": ((0x0250, 0x02AF),),
+	"SpacingModifierLetters": ((0x02B0, 0x02FF),),
+	"CombiningDiacriticalMarks": ((0x0300, 0x036F),),
+	"Greek": ((0x0370, 0x03FF),),
+	"Cyrillic": ((0x0400, 0x04FF),),
+	"Armenian": ((0x0530, 0x058F),),
+	"Hebrew": ((0x0590, 0x05FF),),
+	"Arabic": ((0x0600, 0x06FF),),
+	"Syriac": ((0x0700, 0x074F),),
+	"Thaana": ((0x0780, 0x07BF),),
+	"Devanagari": ((0x0900, 0x097F),),
+	"Bengali": ((0x0980, 0x09FF),),
+	"Gurmukhi": ((0x0A00, 0x0A7F),),
+	"Gujarati": ((0x0A80, 0x0AFF),),
+	"Oriya": ((0x0B00, 0x0B7F),),
+	"Tamil": ((0x0B80, 0x0BFF),),
+	"Telugu": ((0x0C00, 0x0C7F),),
+	"Kannada": ((0x0C80, 0x0CFF),),
+	"Malayalam": ((0x0D00, 0x0D7F),),
+	"Sinhala": ((0x0D80, 0x0DFF),),
+	"Thai": ((0x0E00, 0x0E7F),),
+	"Lao": ((0x0E80, 0x0EFF),),
+	"Tibetan": ((0x0F00, 0x0FFF),),
+	"Myanmar": ((0x1000, 0x109F),),
+	"Georgian": ((0x10A0, 0x10FF),),
+	"HangulJamo": ((0x1100, 0x11FF),),
+	"Ethiopic": ((0x1200, 0x137F),),
+	"Cherokee": ((0x13A0, 0x13FF),),
+	"UnifiedCanadianAboriginalSyllabics": ((0x1400, 0x167F),),
+	"Ogham": ((0x1680, 0x169F),),
+	"Runic": ((0x16A0, 0x16FF),),
+	"Khmer": ((0x1780, 0x17FF),),
+	"Mongolian": ((0x1800, 0x18AF),),
+	"LatinExtendedAdditional": ((0x1E00, 0x1EFF),),
+	"GreekExtended": ((0x1F00, 0x1FFF),),
+	"GeneralPunctuation": ((0x2000, 0x206F),),
+	"SuperscriptsandSubscripts": ((0x2070, 0x209F),),
+	"CurrencySymbols": ((0x20A0, 0x20CF),),
+	"CombiningMarksforSymbols": ((0x20D0, 0x20FF),),
+	"LetterlikeSymbols": ((0x2100, 0x214F),),
+	"NumberForms": ((0x2150, 0x218F),),
+	"Arrows": ((0x2190, 0x21FF),),
+	"MathematicalOperators": ((0x2200, 0x22FF),),
+	"MiscellaneousTechnical": ((0x2300, 0x23FF),),
+	"ControlPictures": ((0x2400, 0x243F),),
+	"OpticalCharacterRecognition": ((0x2440, 0x245F),),
+	"EnclosedAlphanumerics": ((0x2460, 0x24FF),),
+	"BoxDrawing": ((0x2500, 0x257F),),
+	"BlockElements": ((0x2580, 0x259F),),
+	"GeometricShapes": ((0x25A0, 0x25FF),),
+	"MiscellaneousSymbols": ((0x2600, 0x26FF),),
+	"Dingbats": ((0x2700, 0x27BF),),
+	"BraillePatterns": ((0x2800, 0x28FF),),
+	"CJKRadicalsSupplement": ((0x2E80, 0x2EFF),),
+	"KangxiRadicals": ((0x2F00, 0x2FDF),),
+	"IdeographicDescriptionCharacters": ((0x2FF0, 0x2FFF),),
+	"CJKSymbolsandPunctuation": ((0x3000, 0x303F),),
+	"Hiragana": ((0x3040, 0x309F),),
+	"Katakana": ((0x30A0, 0x30FF),),
+	"Bopomofo": ((0x3100, 0x312F),),
+	"HangulCompatibilityJamo": ((0x3130, 0x318F),),
+	"Kanbun": ((0x3190, 0x319F),),
+	"BopomofoExtended": ((0x31A0, 0x31BF),),
+	"EnclosedCJKLettersandMonths": ((0x3200, 0x32FF),),
+	"CJKCompatibility": ((0x3300, 0x33FF),),
+	"CJKUnifiedIdeographsExtensionA": ((0x3400, 0x4DB5),),
+	"CJKUnifiedIdeographs": ((0x4E00, 0x9FFF),),
+	"YiSyllables": ((0xA000, 0xA48F),),
+	"YiRadicals": ((0xA490, 0xA4CF),),
+	"HangulSyllables": ((0xAC00, 0xD7A3),),
+	"HighSurrogates": ((0xD800, 0xDB7F),),
+	"HighPrivateUseSurrogates": ((0xDB80, 0xDBFF),),
+	"LowSurrogates": ((0xDC00, 0xDFFF),),
+	"PrivateUse": ((0xE000, 0xF8FF), (0xF0000, 0xFFFFD), (0x100000, 0x10FFFD)),
+	"CJKCompatibilityIdeographs": ((0xF900, 0xFAFF),),
+	"AlphabeticPresentationForms": ((0xFB00, 0xFB4F),),
+	"ArabicPresentationForms-A": ((0xFB50, 0xFDFF),),
+	"CombiningHalfMarks": ((0xFE20, 0xFE2F),),
+	"CJKCompatibilityForms": ((0xFE30, 0xFE4F),),
+	"SmallFormVariants": ((0xFE50, 0xFE6F),),
+	"ArabicPresentationForms-B": ((0xFE70, 0xFEFE),),
+	"Specials": ((0xFEFF, 0xFEFF), (0xFFF0, 0xFFFD)),
+	"HalfwidthandFullwidthForms": ((0xFF00, 0xFFEF),),
+	"OldItalic": ((0x10300, 0x1032F),),
+	"Gothic": ((0x10330, 0x1034F),),
+	"Deseret": ((0x10400, 0x1044F),),
+	"ByzantineMusicalSymbols": ((0x1D000, 0x1D0FF),),
+	"MusicalSymbols": ((0x1D100, 0x1D1FF),),
+	"MathematicalAlphanumericSymbols": ((0x1D400, 0x1D7FF),),
+	"CJKUnifiedIdeographsExtensionB": ((0x20000, 0x2A6D6),),
+	"CJKCompatibilityIdeographsSupplement": ((0x2F800, 0x2FA1F),),
+	"Tags": ((0xE0000, 0xE007F),),
+}
+
+# XSD 1.1, Part 2: G.4.2.4 Multi-Character Escapes
+# NOTE: \i and \c follow the NameStartChar and NameChar productions of XML 1.0 (Fifth Edition).
+_nameStartChars = _normalizedRanges([
+	(ord(":"), ord(":")), (ord("A"), ord("Z")), (ord("_"), ord("_")), (ord("a"), ord("z")),
+	(0xC0, 0xD6), (0xD8, 0xF6), (0xF8, 0x2FF), (0x370, 0x37D), (0x37F, 0x1FFF), (0x200C, 0x200D), (0x2070, 0x218F),
+	(0x2C00, 0x2FEF), (0x3001, 0xD7FF), (0xF900, 0xFDCF), (0xFDF0, 0xFFFD), (0x10000, 0xEFFFF),
+])
+_nameChars = _normalizedRanges(_nameStartChars + (
+	(ord("-"), ord("-")), (ord("."), ord(".")), (ord("0"), ord("9")), (0xB7, 0xB7), (0x300, 0x36F), (0x203F, 0x2040),
+))
+
+@functools.lru_cache(maxsize=None)
+def _multiCharEscapeRanges(c: str) -> _Ranges:
+	if c.isupper():
+		return _complementRanges(_multiCharEscapeRanges(c.lower()))
+
+	if c == "s":
+		return ((0x9, 0xA), (0xD, 0xD), (0x20, 0x20))
+
+	if c == "i":
+		return _nameStartChars
+
+	if c == "c":
+		return _nameChars
+
+	if c == "d":
+		return _categoryRanges("Nd")
+
+	assert c == "w"
+
+	return _complementRanges(_normalizedRanges(_categoryRanges("P") + _categoryRanges("Z") + _categoryRanges("C")))
+
+# XSD 1.1, Part 2: G.4.2.5 Wildcard Escape
+_wildcardRanges = _complementRanges(((0xA, 0xA), (0xD, 0xD)))
+
+# XSD 1.1, Part 2: G.4.2.1 Single-Character Escapes
+_singleCharEscapes = { "n": "\n", "r": "\r", "t": "\t", **{ c: c for c in "\\|.?*+(){}-[]^" } }
+
+# NOTE: This is the largest quantity Python's 're' accepts (one below the internal MAXREPEAT), so that larger ones raise
+#       TypeError from the parser. 're' counts repetitions rather than unrolling them, so any smaller quantity is cheap
+#       for it. 'LinearRegex' does unroll them, and rejects far smaller ones (see '_maxNFAStates').
+_maxQuantity = 2**32 - 2
+
+# NOTE: 'LinearRegex' builds a state for each character class as often as quantities repeat it, so it takes regular
+#       expressions of at most this many states. The DFA states it keeps hold at most this many NFA states between them,
+#       which bounds its memory (at a few megabytes) however large each DFA state is.
+_maxNFAStates = 2**13
+_maxKeptNFAStates = 2**18
+
+_quantity = re.compile(r"\{(?P<minimum>[0-9]+)(?P<range>,(?P<maximum>[0-9]*))?\}")
+_escapeName = re.compile(r"\{(?P<name>[A-Za-z0-9-]+)\}")
+
+
+###
+
+
+class _Parser:
+	def __init__(self, regex: str) -> None:
+		self.regex = regex
+		self.i = 0
+
+	def error(self) -> TypeError:
+		return TypeError("Not a regular expression (at {}): '{}'".format(self.i, self.regex))
+
+	def peek(self, offset: int = 0) -> str:
+		return self.regex[self.i + offset:self.i + offset + 1]
+
+	def parse(self) -> _Node:
+		node = self.regExp()
+
+		if self.i != len(self.regex):
+			raise self.error()
+
+		return node
+
+	# regExp ::= branch ( '|' branch )*
+	def regExp(self) -> _Node:
+		branches = [self.branch()]
+
+		while self.peek() == "|":
+			self.i += 1
+			branches.append(self.branch())
+
+		return branches[0] if len(branches) == 1 else Alternation(tuple(branches))
+
+	# branch ::= piece*
+	def branch(self) -> _Node:
+		pieces = []
+
+		while self.peek() not in { "", "|", ")" }:
+			pieces.append(self.piece())
+
+		return pieces[0] if len(pieces) == 1 else Sequence(tuple(pieces))
+
+	# piece ::= atom quantifier?
+	# quantifier ::= [?*+] | ( '{' quantity '}' )
+	def piece(self) -> _Node:
+		atom = self.atom()
+		c = self.peek()
+
+		if c in { "?", "*", "+" }:
+			self.i += 1
+
+			return Repetition(atom, 1 if c == "+" else 0, 1 if c == "?" else None)
+
+		if c == "{":
+			m = _quantity.match(self.regex, self.i)
+
+			if m is None:
+				raise self.error()
+
+			minimum = int(m.group("minimum"))
+			maximum = minimum if m.group("range") is None else int(m.group("maximum")) if m.group("maximum") else None
+
+			if (maximum is not None and maximum < minimum) or max(minimum, maximum or 0) > _maxQuantity:
+				raise self.error()
+
+			self.i = m.end()
+
+			return Repetition(atom, minimum, maximum)
+
+		return atom
+
+	# atom ::= NormalChar | charClass | ( '(' regExp ')' )
+	# charClass ::= SingleCharEsc | charClassEsc | charClassExpr | WildcardEsc
+	def atom(self) -> _Node:
+		c = self.peek()
+
+		if c == "(":
+			self.i += 1
+			node = self.regExp()
+
+			if self.peek() != ")":
+				raise self.error()
+
+			self.i += 1
+
+			return node
+
+		if c == "[":
+			return CharClass(self.charClassExpr())
+
+		if c == "\\":
+			return CharClass(self.escape()[0])
+
+		if c == ".":
+			self.i += 1
+
+			return CharClass(_wildcardRanges)
+
+		# NormalChar ::= [^.\?*+{}()|#x5B#x5D]
+		if c == "" or c in ".\\?*+{}()|[]":
+			raise self.error()
+
+		self.i += 1
+
+		return CharClass(((ord(c), ord(c)),))
+
+	# NOTE: This gives the code points of the escape, and whether it is a single character.
+	def escape(self) -> typing.Tuple[_Ranges, bool]:
+		c = self.peek(1)
+		self.i += 2
+
+		if c in _singleCharEscapes:
+			return (((ord(_singleCharEscapes[c]), ord(_singleCharEscapes[c])),), True)
+
+		if c != "" and c in "sSiIcCdDwW":
+			return (_multiCharEscapeRanges(c), False)
+
+		if c in { "p", "P" }:
+			m = _escapeName.match(self.regex, self.i)
+
+			if m is None:
+				raise self.error()
+
+			name = m.group("name")
+
+			if name in _categories:
+				ranges = _categoryRanges(name)
+			elif name.startswith("Is") and name[2:] in _blocks:
+				ranges = _blocks[name[2:]]
+			else:
+				raise self.error()
+
+			self.i = m.end()
+
+			return (_complementRanges(ranges) if c == "P" else ranges, False)
+
+		raise self.error()
+
+	# charClassExpr ::= '[' charGroup ']'
+	def charClassExpr(self) -> _Ranges:
+		self.i += 1
+		ranges = self.charGroup()
+
+		if self.peek() != "]":
+			raise self.error()
+
+		self.i += 1
+
+		return ranges
+
+	# charGroup ::= ( posCharGroup | negCharGroup ) ( '-' charClassExpr )?
+	# negCharGroup ::= '^' posCharGroup
+	# NOTE: A '-' stands for itself only at the start or end of a group.
+	def charGroup(self) -> _Ranges:
+		negated = self.peek() == "^"
+
+		if negated:
+			self.i += 1
+
+		start = self.i
+		parts = []  # type: typing.List[typing.Tuple[int, int]]
+
+		while self.peek() != "]" and not (self.peek() == "-" and self.peek(1) == "["):
+			if self.peek() == "\\":
+				(ranges, single) = self.escape()
+
+				if not single:
+					parts.extend(ranges)
+
+					if self.peek() == "-" and self.peek(1) not in { "]", "[" }:
+						raise self.error()
+
+					continue
+
+				first = ranges[0][0]
+			else:
+				first = self.singleChar(self.i == start)
+
+			if self.peek() == "-" and self.peek(1) not in { "]", "[", "" }:
+				self.i += 1
+
+				if self.peek() == "\\":
+					(ranges, single) = self.escape()
+
+					if not single:
+						raise self.error()
+
+					last = ranges[0][0]
+				else:
+					last = self.singleChar(True)
+
+				if last < first:
+					raise self.error()
+
+				parts.append((first, last))
+			else:
+				parts.append((first, first))
+
+		if self.i == start:
+			raise self.error()
+
+		ranges = _normalizedRanges(parts)
+
+		if negated:
+			ranges = _complementRanges(ranges)
+
+		if self.peek() == "-":
+			self.i += 1
+			ranges = _differenceRanges(ranges, self.charClassExpr())
+
+		return ranges
+
+	def singleChar(self, dash_allowed: bool) -> int:
+		c = self.peek()
+
+		if c in { "", "[", "]", "\\" } or (c == "-" and not (dash_allowed or self.peek(1) == "]")):
+			raise self.error()
+
+		self.i += 1
+
+		return ord(c)
+
+
+###
+
+
+def parse_regex(regex: str) -> _Node:
+	if not isinstance(regex, str):
+		raise TypeError("Not a regular expression: {}".format(regex))
+
+	return _Parser(regex).parse()
+
+def _translatedChar(c: int) -> str:
+	if c < 0x80:
+		return re.escape(chr(c))
+
+	return "\\u{:04x}".format(c) if c <= 0xFFFF else "\\U{:08x}".format(c)
+
+def _translatedNode(node: _Node) -> str:
+	if isinstance(node, CharClass):
+		if not node.ranges:
+			return "(?!)"
+
+		if len(node.ranges) == 1 and node.ranges[0][0] == node.ranges[0][1]:
+			return _translatedChar(node.ranges[0][0])
+
+		return "[" + "".join(_translatedChar(a) if a == b else _translatedChar(a) + "-" + _translatedChar(b) for (a, b) in node.ranges) + "]"
+
+	if isinstance(node, Sequence):
+		return "".join(_translatedNode(piece) for piece in node.pieces)
+
+	if isinstance(node, Alternation):
+		return "(?:" + "|".join(_translatedNode(branch) for branch in node.branches) + ")"
+
+	assert isinstance(node, Repetition)
+
+	quantifier = { (0, 1): "?", (0, None): "*", (1, None): "+" }.get((node.minimum, node.maximum))
+
+	if quantifier is None:
+		quantifier = "{{{},{}}}".format(node.minimum, "" if node.maximum is None else node.maximum)
+
+	return "(?:" + _translatedNode(node.atom) + ")" + quantifier
+
+# NOTE: XSD regular expressions are implicitly anchored at both ends, so translations are to be used with 'fullmatch'.
+@functools.lru_cache(maxsize=None)
+def translate_regex(regex: str) -> str:
+	return _translatedNode(parse_regex(regex))
+
+# NOTE: Several regular expressions are compiled as alternatives, as the values of one pattern facet are. Compiled
+#       patterns are kept for the life of the process, keyed by the text of the regular expressions.
+@functools.lru_cache(maxsize=None)
+def compile_regex(*regexes: str) -> typing.Pattern[str]:
+	try:
+		return re.compile("|".join("(?:" + translate_regex(regex) + ")" for regex in regexes))
+	except (re.error, OverflowError) as e:
+		raise TypeError("Not a regular expression ({}): {}".format(e, ", ".join(map(repr, regexes)))) from None
+
+
+###
+
+
+# NOTE: This is the number of states '_nfaFragment' builds for 'node', counted without building them.
+def _nfaSize(node: _Node) -> int:
+	if isinstance(node, CharClass):
+		return 1
+
+	if isinstance(node, Sequence):
+		return sum(map(_nfaSize, node.pieces))
+
+	if isinstance(node, Alternation):
+		return 1 + sum(map(_nfaSize, node.branches))
+
+	assert isinstance(node, Repetition)
+
+	size = _nfaSize(node.atom)
+	minimum = node.minimum  # type: int
+	maximum = node.maximum  # type: typing.Optional[int]
+
+	if maximum is None:
+		return 1 + size + minimum * size
+
+	return (maximum - minimum) * (1 + size) + minimum * size
+
+# NOTE: This matches in time linear in the length of the string, whatever the regular expression, by running a Thompson
+#       NFA built from the parse tree. Sets of NFA states become DFA states lazily, as characters are read, and the DFA
+#       transitions are kept for later strings. When more than 'max_states' DFA states have been built, or they hold
+#       more than '_maxKeptNFAStates' NFA states between them, all of them are dropped and building starts again, which
+#       bounds the memory used without giving up linear time. Regular expressions whose NFA would have more than
+#       '_maxNFAStates' states (e.g. '[0-9]{1000000}') raise TypeError.
+# NOTE: Code points are split into classes that every character class of the regular expression either wholly contains
+#       or wholly excludes. Transitions are kept per character for ASCII, which is the common case and the fastest to
+#       look up, and per class otherwise. So a DFA state holds at most 128 transitions plus one for each class, however
+#       many distinct characters are read.
+# NOTE: A matcher can be shared between threads. Matching reads the transitions without locking; building a state or a
+#       transition holds a lock, and dropping the states replaces their dictionary rather than changing it in place.
+class LinearRegex:
+	def __init__(self, *regexes: str, max_states: int = 1024) -> None:
+		# NOTE: Just after the states are dropped, the start state, the current state and the next are built again.
+		if not (isinstance(max_states, int) and max_states >= 3):
+			raise TypeError("Not a number of states of at least 3: {}".format(max_states))
+
+		self.max_states = max_states
+
+		self._classes = []  # type: typing.List[typing.Optional[_Ranges]]
+		self._firsts = []  # type: typing.List[typing.List[int]]
+		self._edges = []  # type: typing.List[typing.List[int]]
+
+		nodes = [parse_regex(regex) for regex in regexes]
+
+		if 2 + sum(map(_nfaSize, nodes)) > _maxNFAStates:
+			raise TypeError("Regular expression too large to match in linear time: {}".format(", ".join(map(repr, regexes))))
+
+		self._accept = self._nfaState(None)
+		self._nfaStart = self._nfaState(None)
+		self._edges[self._nfaStart] = [self._nfaFragment(node, self._accept) for node in nodes]
+
+		# NOTE: Class 'k' holds the code points from _boundaries[k - 1] (or 0) up to, but not including, _boundaries[k].
+		self._boundaries = sorted({ b for ranges in self._classes if ranges is not None for (first, last) in ranges for b in (first, last + 1) })
+
+		self._lock = threading.Lock()
+		self._states = {}  # type: typing.Dict[typing.FrozenSet[int], _DFAState]
+		self._keptNFAStates = 0
+		self._dead = _DFAState(frozenset(), False)
+		self._start = self._dfaState(self._closure([self._nfaStart]))
+
+	def fullmatch(self, string: str) -> bool:
+		state = self._start
+		(dead, boundaries) = (self._dead, self._boundaries)
+
+		for c in string:
+			next_state = state.transitions.get(c)
+
+			if next_state is None and c >= "\x80":
+				next_state = state.transitions.get(bisect.bisect_right(boundaries, ord(c)))
+
+			if next_state is None:
+				next_state = self._transition(state, c)
+
+			if next_state is dead:
+				return False
+
+			state = next_state
+
+		return state.accepting
+
+	def cache_size(self) -> int:
+		return len(self._states)
+
+	def _nfaState(self, ranges: typing.Optional[_Ranges]) -> int:
+		self._classes.append(ranges)
+		self._firsts.append([first for (first, last) in ranges] if ranges is not None else [])
+		self._edges.append([])
+
+		return len(self._classes) - 1
+
+	# NOTE: This builds the states matching 'node', followed by state 'out', and gives the first of them.
+	def _nfaFragment(self, node: _Node, out: int) -> int:
+		if isinstance(node, CharClass):
+			s = self._nfaState(node.ranges)
+			self._edges[s].append(out)
+
+			return s
+
+		if isinstance(node, Sequence):
+			for piece in reversed(node.pieces):
+				out = self._nfaFragment(piece, out)
+
+			return out
+
+		if isinstance(node, Alternation):
+			s = self._nfaState(None)
+			self._edges[s] = [self._nfaFragment(branch, out) for branch in node.branches]
+
+			return s
+
+		assert isinstance(node, Repetition)
+
+		if node.maximum is None:
+			s = self._nfaState(None)
+			self._edges[s] = [self._nfaFragment(node.atom, s), out]
+			out = s
+		else:
+			for _ in range(node.maximum - node.minimum):
+				s = self._nfaState(None)
+				self._edges[s] = [self._nfaFragment(node.atom, out), out]
+				out = s
+
+		for _ in range(node.minimum):
+			out = self._nfaFragment(node.atom, out)
+
+		return out
+
+	# NOTE: This gives the states reached without reading a character, less those that only lead elsewhere.
+	def _closure(self, states: typing.Iterable[int]) -> typing.FrozenSet[int]:
+		seen = set()  # type: typing.Set[int]
+		stack = list(states)
+		closure = []
+
+		while stack:
+			s = stack.pop()
+
+			if s in seen:
+				continue
+
+			seen.add(s)
+
+			if self._classes[s] is None and s != self._accept:
+				stack.extend(self._edges[s])
+			else:
+				closure.append(s)
+
+		return frozenset(closure)
+
+	def _dfaState(self, nfa_states: typing.FrozenSet[int]) -> "_DFAState":
+		if not nfa_states:
+			return self._dead
+
+		state = self._states.get(nfa_states)
+
+		if state is None:
+			state = _DFAState(nfa_states, self._accept in nfa_states)
+			self._states[nfa_states] = state
+			self._keptNFAStates += len(nfa_states)
+
+		return state
+
+	# NOTE: 'state' may have been dropped by another thread since it was read, so it is looked up again by its NFA states.
+	def _transition(self, state: "_DFAState", c: str) -> "_DFAState":
+		code_point = ord(c)
+		key = c if code_point < 0x80 else bisect.bisect_right(self._boundaries, code_point)  # type: typing.Union[str, int]
+		targets = []
+
+		for s in state.nfa_states:
+			ranges = self._classes[s]
+
+			if ranges is not None:
+				i = bisect.bisect_right(self._firsts[s], code_point) - 1
+
+				if i >= 0 and code_point <= ranges[i][1]:
+					targets.append(self._edges[s][0])
+
+		nfa_states = self._closure(targets)
+
+		with self._lock:
+			missing = [n for n in { state.nfa_states, nfa_states } if n and n not in self._states]
+
+			if len(self._states) + len(missing) > self.max_states or self._keptNFAStates + sum(map(len, missing)) > _maxKeptNFAStates:
+				self._flush()
+
+			state = self._dfaState(state.nfa_states)
+			next_state = self._dfaState(nfa_states)
+			state.transitions[key] = next_state
+
+		return next_state
+
+	# NOTE: Other threads may still be walking the dropped states, which only lose their transitions.
+	def _flush(self) -> None:
+		(states, self._states) = (self._states, {})
+		self._keptNFAStates = 0
+
+		for state in states.values():
+			state.transitions.clear()
+
+		self._start = self._dfaState(self._start.nfa_states)
+
+
+class _DFAState:
+	__slots__ = ("nfa_states", "accepting", "transitions")
+
+	def __init__(self, nfa_states: typing.FrozenSet[int], accepting: bool) -> None:
+		self.nfa_states = nfa_states
+		self.accepting = accepting
+		self.transitions = {}  # type: typing.Dict[typing.Union[str, int], _DFAState]
+
+# NOTE: As with 'compile_regex', matchers are kept for the life of the process, keyed by the regular expressions.
+@functools.lru_cache(maxsize=None)
+def compile_linear_regex(*regexes: str, max_states: int = 1024) -> LinearRegex:
+	return LinearRegex(*regexes, max_states=max_states)
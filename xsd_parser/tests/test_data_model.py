@@ -1,2 +1,212 @@
 #!/usr/bin/env python3
 
+import decimal
+import unittest
+import unittest.mock
+
+from ..data_model import *
+from ..datatypes import DurationValue
+
+
+# NOTE: A plain Type Definition stands in for xs:anySimpleType, which can't be built while 'variety' must be a Keyword.
+def builtin_definitions():
+	any_simple_type = TypeDefinition()
+
+	return { name: SimpleTypeDefinitionBase(name=name, target_namespace=xsd_namespace, base_type_definition=any_simple_type, variety=Keyword("atomic")) for name in builtin_datatypes }
+
+def restriction(base, *facets):
+	return SimpleTypeDefinitionBase(name="restriction", base_type_definition=base, facets=set(facets), variety=Keyword("atomic"))
+
+
+class TestDataModelSimpleTypeDefinitions(unittest.TestCase):
+	def setUp(self) -> None:
+		self.builtins = builtin_definitions()
+
+	def test_compile_validator(self) -> None:
+		price = restriction(self.builtins["decimal"], MinInclusive(value=decimal.Decimal(0), fixed=False), FractionDigits(value=2, fixed=False))
+		price_under_100 = restriction(price, MaxExclusive(value=decimal.Decimal(100), fixed=False), TotalDigits(value=4, fixed=False))
+		code = restriction(self.builtins["string"], WhiteSpace(value=Keyword("collapse"), fixed=False), Length(value=3, fixed=False), Pattern(value={"[A-Z]+", "[0-9]+"}))
+		hex_code = restriction(code, Pattern(value={"[0-9A-F]+"}), Enumeration(value={"ABC", "FFF", "XYZ", "123"}))
+
+		valid_inputs = [
+			(self.builtins["boolean"], " true\n", True),
+			(self.builtins["string"], " a\tb ", " a\tb "),
+			(price, "12.50", decimal.Decimal("12.50")),
+			(price, "\t1000.1 ", decimal.Decimal("1000.1")),
+			(price_under_100, "99.99", decimal.Decimal("99.99")),
+			(price_under_100, "0", decimal.Decimal(0)),
+			(code, " ABC ", "ABC"),
+			(code, "123", "123"),
+			(hex_code, "FFF", "FFF"),
+			(restriction(self.builtins["decimal"], TotalDigits(value=3, fixed=False)), "-010.500", decimal.Decimal("-10.5")),
+			(restriction(self.builtins["duration"], MaxInclusive(value=DurationValue(0, decimal.Decimal(86400)), fixed=False)), "PT24H", DurationValue(0, decimal.Decimal(86400))),
+		]
+
+		# Test valid literals are normalized and mapped to their values.
+		for (definition, literal, value) in valid_inputs:
+			with self.subTest(literal=literal):
+				self.assertEqual(definition.compile_validator()(literal), value)
+
+		invalid_inputs = [
+			(self.builtins["decimal"], "1.0.0"),
+			(self.builtins["decimal"], 1),
+			(self.builtins["string"], "\x00"),
+			(price, "-0.01"),
+			(price, "1.005"),
+			(price_under_100, "100"),
+			(price_under_100, "100.00"),
+			(price_under_100, "99.995"),
+			(code, "AB"),
+			(code, "A1C"),
+			(hex_code, "XYZ"),
+			(hex_code, "DEF"),
+			(restriction(self.builtins["decimal"], TotalDigits(value=3, fixed=False)), "1.234"),
+			(restriction(self.builtins["float"], MinInclusive(value=decimal.Decimal(0), fixed=False)), "NaN"),
+			(restriction(self.builtins["duration"], MaxInclusive(value=DurationValue(0, decimal.Decimal(86400)), fixed=False)), "P1M"),
+		]
+
+		# Test invalid literals raise TypeError, whether from the lexical space or a facet.
+		for (definition, literal) in invalid_inputs:
+			with self.subTest(literal=literal):
+				with self.assertRaises(TypeError):
+					definition.compile_validator()(literal)
+
+		# Test patterns can be matched in linear time.
+		with self.subTest():
+			self.assertEqual(hex_code.compile_validator(linear_patterns=True)("FFF"), "FFF")
+			self.assertEqual(hex_code.compile_validator(linear_patterns=True, max_states=3)("ABC"), "ABC")
+
+			with self.assertRaises(TypeError):
+				restriction(self.builtins["string"], Pattern(value={"(a*)*b"})).compile_validator(linear_patterns=True)("a" * 10000)
+
+		# Test bounds given as literals are compared as values of the datatype.
+		with self.subTest():
+			validate = restriction(self.builtins["decimal"], MinInclusive(value="5", fixed=False), MaxExclusive(value="10.0", fixed=False)).compile_validator()
+
+			self.assertEqual(validate("5.0"), decimal.Decimal("5.0"))
+
+			for literal in ["4.99", "10"]:
+				with self.assertRaises(TypeError):
+					validate(literal)
+
+		# Test list and union types are not yet supported.
+		with self.subTest():
+			with self.assertRaises(NotImplementedError):
+				SimpleTypeDefinitionBase(name="list", base_type_definition=self.builtins["string"], variety=Keyword("list"), item_type_definition=self.builtins["string"]).compile_validator()
+
+	def test_effective_facets(self) -> None:
+		(minimum, maximum, length) = (MinInclusive(value=decimal.Decimal(0), fixed=True), MaxInclusive(value=decimal.Decimal(100), fixed=False), Length(value=3, fixed=False))
+		(pattern, derived_maximum) = (Pattern(value={"[0-9]+"}), MaxInclusive(value=decimal.Decimal(50), fixed=False))
+
+		base = restriction(self.builtins["decimal"], minimum, maximum, pattern)
+		derived = restriction(restriction(base, length), derived_maximum, Pattern(value={"[1-9].*"}), MinInclusive(value=decimal.Decimal(0), fixed=False))
+
+		# Test facets are merged along the chain, with fixed facets kept.
+		with self.subTest():
+			effective_facets = derived.effective_facets()
+
+			self.assertEqual(effective_facets.facets, { MinInclusive: minimum, MaxInclusive: derived_maximum, Length: length })
+			self.assertEqual(len(effective_facets.patterns), 2)
+			self.assertIs(effective_facets.patterns[0], pattern)
+
+		# Test the merge is kept until a definition in the chain changes.
+		with self.subTest():
+			self.assertIs(derived.effective_facets(), derived.effective_facets())
+
+			base.facets.discard(maximum)
+			derived.base_type_definition.facets.add(WhiteSpace(value=Keyword("collapse"), fixed=True))
+
+			self.assertEqual(set(derived.effective_facets().facets), { MinInclusive, MaxInclusive, Length, WhiteSpace })
+			self.assertEqual(base.effective_facets().facets, { MinInclusive: minimum })
+
+			derived.base_type_definition = self.builtins["decimal"]
+
+			self.assertEqual(len(derived.effective_facets().patterns), 1)
+
+		# Test a kept merge is returned without walking the chain, until a facet changes in place.
+		with self.subTest():
+			fixed_minimum = MinInclusive(value=decimal.Decimal(0), fixed=True)
+			fixed_base = restriction(self.builtins["decimal"], fixed_minimum)
+			fixed_derived = restriction(restriction(fixed_base), MinInclusive(value=decimal.Decimal(0), fixed=False))
+			fixed_derived.effective_facets()
+
+			with unittest.mock.patch.object(fixed_base, "effective_facets", side_effect=AssertionError):
+				fixed_derived.effective_facets()
+
+			fixed_minimum.value = decimal.Decimal(1)
+
+			with self.assertRaises(TypeError):
+				fixed_derived.effective_facets()
+
+		# Test a facet fixed in a base type definition can't be given another value.
+		with self.subTest():
+			with self.assertRaises(TypeError):
+				restriction(base, MinInclusive(value=decimal.Decimal(1), fixed=False)).effective_facets()
+
+
+class TestDataModelConstrainingFacets(unittest.TestCase):
+	def test_Pattern(self) -> None:
+		facet = Pattern(value={"\\i\\c*", "[0-9]{3}"})
+
+		# Test the regular expressions are compiled together, as XSD reads them.
+		with self.subTest():
+			self.assertEqual([facet.regex.fullmatch(s) is not None for s in ["_a1", "123", "1a", "^_a1$"]], [True, True, False, False])
+			self.assertEqual(repr(facet), "Pattern(annotations=[], value={})".format(repr(facet.value)))
+
+		# Test the compiled pattern is kept, and rebuilt when the values change.
+		with self.subTest():
+			self.assertIs(facet.regex, facet.regex)
+
+			facet.value.add("b")
+
+			self.assertEqual([facet.regex.fullmatch("b") is not None, facet.linear_regex().fullmatch("b")], [True, True])
+
+		# Test the linear matcher keeps the number of states it is given.
+		with self.subTest():
+			self.assertEqual([facet.linear_regex().max_states, facet.linear_regex(max_states=3).max_states], [1024, 3])
+
+		# Test malformed regular expressions are rejected.
+		for value in [{"[a"}, {"a", "(b"}, {"a{99999999999}"}]:
+			with self.subTest(value=value):
+				with self.assertRaises(TypeError):
+					Pattern(value=value)
+
+	def test_Enumeration(self) -> None:
+		builtins = builtin_definitions()
+
+		valid_inputs = [
+			("decimal", {"1.0", decimal.Decimal("2.50")}, ["1", "01.00", "2.5"], ["1.01", "3"]),
+			("boolean", {"true"}, ["true", "1"], ["false", "0"]),
+			("double", {"NaN", "0", "INF"}, ["NaN", "-0", "0.0E0", "+INF"], ["-INF", "1E-300"]),
+			("duration", {"PT24H"}, ["P1D", "PT86400S"], ["P1M", "-P1D"]),
+			("string", {"a", " b"}, ["a", " b"], ["b", "A"]),
+		]
+
+		# Test literals match when their values are equal or identical to an enumerated value.
+		for (name, value, matching, not_matching) in valid_inputs:
+			with self.subTest(datatype=name):
+				validate = restriction(builtins[name], Enumeration(value=value)).compile_validator()
+
+				for literal in matching:
+					validate(literal)
+
+				for literal in not_matching:
+					with self.assertRaises(TypeError):
+						validate(literal)
+
+		# Test the index is kept, and rebuilt when the values change.
+		with self.subTest():
+			facet = Enumeration(value={"1.0"})
+
+			self.assertIs(facet.value_index(datatypes.Decimal), facet.value_index(datatypes.Decimal))
+			self.assertEqual(facet.value_index(datatypes.Decimal)[1], frozenset(["1"]))
+
+			facet.value.add("2.00")
+
+			self.assertEqual(facet.value_index(datatypes.Decimal)[1], frozenset(["1", "2"]))
+			self.assertEqual(facet.value_index(datatypes.String)[1], frozenset(["1.0", "2.00"]))
+
+		# Test enumerated literals outside the lexical space are rejected.
+		with self.subTest():
+			with self.assertRaises(TypeError):
+				Enumeration(value={"x"}).value_index(datatypes.Decimal)
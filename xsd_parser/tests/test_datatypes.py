@@ -1,11 +1,16 @@
 #!/usr/bin/env python3
 
+import concurrent.futures
 import decimal
 import itertools
+import math
+import random
+import re
 import typing
 import unittest
 import unittest.mock
 
+from .. import datatypes
 from ..datatypes import (
 	_digitValue,
 	_digitSequenceValue,
@@ -18,6 +23,7 @@ from ..datatypes import (
 	_fractionDigitRemainderSeq,
 	_fractionDigitSeq,
 	_fractionDigitsCanonicalFragmentMap,
+	_binaryFloatingPointRound,
 )
 from ..datatypes import *
 
@@ -47,6 +53,72 @@ class TestDatatypesHelpers(unittest.TestCase):
 			with self.assertRaises(TypeError):
 				check_matches_production(production("bar"), "foo")
 
+		with self.subTest():
+			self.assertIsNone(check_matches_production(compiled_productions["digit"], "1"))
+
+		with self.subTest():
+			with self.assertRaises(TypeError):
+				check_matches_production(compiled_productions["digit"], "foo")
+
+	def test_group(self) -> None:
+		with self.subTest():
+			self.assertEqual(group("bar", "foo"), "(?P<bar>foo)")
+
+		with self.subTest():
+			with self.assertRaises(TypeError):
+				group("bar", False)
+
+	def test_uncaptured(self) -> None:
+		with self.subTest():
+			self.assertEqual(uncaptured("(foo)"), "(?:foo)")
+
+		with self.subTest():
+			self.assertEqual(uncaptured(r"(\(|(?P<bar>foo))"), r"(?:\(|(?P<bar>foo))")
+
+	def test_match_production(self) -> None:
+		with self.subTest():
+			self.assertEqual(match_production(production("foo"), "foo").group(0), "foo")
+
+		with self.subTest():
+			self.assertEqual(match_production(compiled_productions["noDecimalPtNumeral"], "-123").group("unsigned"), "123")
+
+		with self.subTest():
+			with self.assertRaises(TypeError):
+				match_production(compiled_productions["noDecimalPtNumeral"], "foo")
+
+		with self.subTest():
+			with self.assertRaises(TypeError):
+				match_production(compiled_productions["noDecimalPtNumeral"], 123)
+
+	def test_compiled_productions(self) -> None:
+		numerals = ["".join(x) for n in range(5) for x in itertools.product("0.-+eE", repeat=n)]
+		durations = ["".join(x) for n in range(5) for x in itertools.product("-PT1.YMDHS", repeat=n)]
+		durations += [
+			"P1Y2M3DT4H5M6.7S",
+			"-P1Y2M3DT4H5M6.7S",
+			"P12Y",
+			"P12M",
+			"P12D",
+			"PT12H",
+			"PT12M",
+			"PT12.S",
+			"PT.12S",
+			"P1YT1M",
+			"P1Y1D",
+			"P1MT1S",
+			"P1DT1H1S",
+			"P1M1Y",
+			"PT1S1M",
+			"P1Y1YT1H",
+		]
+
+		# Test each compiled production accepts exactly what its spec production accepts.
+		for (name, p) in compiled_productions.items():
+			spec = re.compile(globals()[name])
+
+			with self.subTest(name=name):
+				self.assertEqual([s for s in (durations if "du" in name.lower() else numerals) if bool(p.fullmatch(s)) != bool(spec.fullmatch(s))], [])
+
 
 class TestDatatypesAuxiliaryFunctions(unittest.TestCase):
 
@@ -586,6 +658,9 @@ class TestDatatypesMappings(unittest.TestCase):
 			("-123.456E0", decimal.Decimal("-123.456")),
 			("-0.456E0", decimal.Decimal("-0.456")),
 			("-.456E0", decimal.Decimal("-.456")),
+			("+123e0", decimal.Decimal("123")),
+			("+123.456E0", decimal.Decimal("123.456")),
+			("+.456e0", decimal.Decimal(".456")),
 		]
 
 		invalid_inputs = [
@@ -613,8 +688,151 @@ class TestDatatypesMappings(unittest.TestCase):
 				with self.assertRaises(TypeError):
 					scientificMap(s)
 
+	def test_spec_literal(self) -> None:
+		def results(f: typing.Callable[[str], typing.Any], literals: typing.List[str]) -> typing.List[str]:
+			output = []
+
+			for literal in literals:
+				try:
+					output.append(repr(f(literal)))
+				except TypeError:
+					output.append("TypeError")
+
+			return output
+
+		literals = ["".join(x) for n in range(6) for x in itertools.product("01.-+e", repeat=n)]
+		literals += ["-" + "9" * 20, "+.5E-10", "-0.0e0"]
+
+		functions = [
+			unsignedNoDecimalMap,
+			noDecimalMap,
+			unsignedDecimalPtMap,
+			decimalPtMap,
+			scientificMap,
+			decimalLexicalMap,
+		]
+
+		# Test the validate-once mappings agree with the spec-literal mappings.
+		for f in functions:
+			with unittest.mock.patch.object(datatypes, "spec_literal", True):
+				expected = results(f, literals)
+
+			with self.subTest(f=f.__name__):
+				self.assertEqual(results(f, literals), expected)
+
+		# Test pre-validated numerals skip validation.
+		with self.subTest():
+			self.assertEqual(noDecimalMap("-0123", validate=False), -123)
+
+		with self.subTest():
+			self.assertEqual(decimalPtMap("-0123.450", validate=False), decimal.Decimal("-123.450"))
+
+		# Test long numerals are mapped exactly, regardless of the decimal context precision.
+		with self.subTest():
+			self.assertEqual(str(decimalLexicalMap("0123456789" * 5 + "." + "9876543210" * 2)), "123456789" + "0123456789" * 4 + "." + "9876543210" * 2)
+
+	def test_spec_literal_canonical(self) -> None:
+		def results(f: typing.Callable[[typing.Any], str], values: typing.List[typing.Any]) -> typing.List[str]:
+			output = []
+
+			for value in values:
+				try:
+					output.append(f(value))
+				except TypeError:
+					output.append("TypeError")
+
+			return output
+
+		integers = list(range(-1000, 1001)) + [10**n for n in range(60)] + [7**n for n in range(0, 200, 7)] + [-(10**100 - 1), True, 1.5, "1"]
+		decimals = [decimal.Decimal(x) for x in ["0", "-0", "0.0", "-0.000", "1E+3", "1E-20", "0E-7", "Infinity", "-Infinity"]]
+		decimals += [decimal.Decimal(n).scaleb(e) for n in [1, 7, 10, 1203, -45670, 12345678901234567890] for e in range(-30, 3)]
+		fractions = [decimal.Decimal(x) for x in ["0", "0.0", "0E-7", "0.5", "0.05000", "0.000000000000000000000000000001"]]
+		fractions += [decimal.Decimal(n).scaleb(-e) for n in range(0, 1000, 7) for e in range(3, 8)] + [0.5, "0.5"]
+		durations = [DurationValue(m, decimal.Decimal(s) * sign) for m in [0, 14] for s in [0, 1, 59, 60, 3599, 3600, 86399, 86400, 90061, "90061.5", "0.001", 10**20] for sign in [1, -1] if not (m > 0 and sign < 0 and s != 0)]
+
+		functions = [
+			(unsignedNoDecimalPtCanonicalMap, integers),
+			(noDecimalPtCanonicalMap, integers),
+			(_fractionDigitsCanonicalFragmentMap, fractions),
+			(unsignedDecimalPtCanonicalMap, decimals),
+			(decimalPtCanonicalMap, decimals),
+			(decimalCanonicalMap, decimals),
+			(scientificCanonicalMap, [d for d in decimals if d.is_finite()]),
+			(durationCanonicalMap, durations),
+		]
+
+		# Test the direct canonical mappings agree with the spec-literal canonical mappings.
+		for (f, values) in functions:
+			with unittest.mock.patch.object(datatypes, "spec_literal", True):
+				expected = results(f, values)
+
+			with self.subTest(f=f.__name__):
+				self.assertEqual(results(f, values), expected)
+
+		# Test integers past the string conversion limit.
+		with self.subTest():
+			self.assertEqual(unsignedNoDecimalPtCanonicalMap(int(decimal.Decimal("123456789" * 3000))), "123456789" * 3000)
+
+		with self.subTest():
+			self.assertEqual(noDecimalPtCanonicalMap(-(10**50000)), "-1" + "0" * 50000)
+
+		# Test long fractions are mapped exactly, regardless of the decimal context precision.
+		with self.subTest():
+			self.assertEqual(decimalCanonicalMap(decimal.Decimal("-0." + "0123456789" * 10 + "000")), "-0." + "0123456789" * 10)
+
+		# Test whole numbers of seconds are split exactly, regardless of the decimal context precision.
+		with self.subTest():
+			self.assertEqual(durationCanonicalMap(DurationValue(0, decimal.Decimal(86400 * 10**40 + 3661))), "P1" + "0" * 40 + "DT1H1M1S")
+
 	...
 
+	def test_decimal_context(self) -> None:
+		self.addCleanup(configure_decimal_context)
+
+		# Test the caller's context neither affects the mappings nor is changed by them.
+		with self.subTest():
+			with decimal.localcontext() as context:
+				context.prec = 3
+				context.traps[decimal.Overflow] = False
+
+				self.assertEqual(scientificMap("1.23456789E2"), decimal.Decimal("123.456789"))
+				self.assertEqual(str(durationMap("PT123456789.5S").seconds), "123456789.5")
+
+				with self.assertRaises(decimal.Overflow):
+					scientificMap("1E999999999")
+
+				self.assertIs(decimal.getcontext(), context)
+				self.assertEqual(context.prec, 3)
+
+		configure_decimal_context(prec=5, traps=[])
+
+		# Test the configured precision and traps apply.
+		with self.subTest():
+			self.assertEqual(str(scientificMap("1.23456789E2")), "123.46")
+			self.assertEqual(scientificMap("1E999999999"), decimal.Decimal("Infinity"))
+
+		# Test every thread uses the configured context.
+		with self.subTest():
+			def work(LEX: str) -> str:
+				decimal.getcontext().prec = 2
+
+				return str(scientificMap(LEX))
+
+			with concurrent.futures.ThreadPoolExecutor(4) as executor:
+				self.assertEqual(list(executor.map(work, ["1.23456789E2"] * 8)), ["123.46"] * 8)
+
+		configure_decimal_context()
+
+		# Test reconfiguring applies to threads that already have a context.
+		with self.subTest():
+			self.assertEqual(scientificMap("1.23456789E2"), decimal.Decimal("123.456789"))
+
+		# Test invalid configurations raise TypeError.
+		for (prec, traps) in [(0, []), (1.5, []), (True, []), (28, [ValueError]), (28, ["Overflow"])]:
+			with self.subTest(prec=prec, traps=traps):
+				with self.assertRaises(TypeError):
+					configure_decimal_context(prec, traps)  # type: ignore
+
 	def test_unsignedNoDecimalPtCanonicalMap(self) -> None:
 		valid_inputs = [
 			(0, "0"),
@@ -920,6 +1138,72 @@ class TestDatatypesMappings(unittest.TestCase):
 
 	...
 
+	def test_ScaledDecimal(self) -> None:
+		literals = ["".join(x) for n in range(1, 5) for x in itertools.product("09.-+", repeat=n)]
+		literals += ["-" + "9" * 40 + "." + "0123456789" * 4, "0." + "0" * 50 + "1", "+000.000"]
+
+		# Test the scaled mappings agree with the decimal.Decimal mappings.
+		for LEX in literals:
+			with self.subTest(LEX=LEX):
+				try:
+					d = decimalLexicalMap(LEX)
+				except TypeError:
+					with self.assertRaises(TypeError):
+						scaledDecimalLexicalMap(LEX)
+
+					continue
+
+				v = scaledDecimalLexicalMap(LEX)
+
+				self.assertEqual(str(v.to_decimal()), str(d))
+				self.assertEqual(ScaledDecimal.from_decimal(d), v)
+				self.assertEqual(scaledDecimalCanonicalMap(v), decimalCanonicalMap(d))
+
+		# Test equality, hashing and order are by value, and exact.
+		with self.subTest():
+			self.assertEqual(ScaledDecimal(150, 2), ScaledDecimal(15, 1))
+			self.assertEqual(len({ ScaledDecimal(150, 2), ScaledDecimal(15, 1), ScaledDecimal(0, 3), ScaledDecimal(0, 0) }), 2)
+			self.assertLess(ScaledDecimal(10**40, 0), ScaledDecimal(10**41 + 1, 1))
+			self.assertGreater(ScaledDecimal(-1, 50), ScaledDecimal(-1, 49))
+			self.assertNotEqual(ScaledDecimal(1, 0), (1, 0))
+
+		# Test equal values hash alike.
+		for (a, b) in [(ScaledDecimal(10, 0), ScaledDecimal(1000, 2)), (ScaledDecimal(-7, 3), ScaledDecimal(-70, 4)), (ScaledDecimal(0, 0), ScaledDecimal(0, 5))]:
+			with self.subTest(a=a, b=b):
+				self.assertEqual(a, b)
+				self.assertEqual(hash(a), hash(b))
+
+		# Test conversions from decimal.Decimal.
+		with self.subTest():
+			self.assertEqual(tuple(ScaledDecimal.from_decimal(decimal.Decimal("1E+3"))), (1000, 0))
+			self.assertEqual(tuple(ScaledDecimal.from_decimal(decimal.Decimal("-1.50"))), (-150, 2))
+
+		# Test invalid inputs raise TypeError.
+		for x in [decimal.Decimal("Infinity"), decimal.Decimal("NaN"), 1.5, 1]:
+			with self.subTest(x=x):
+				with self.assertRaises(TypeError):
+					ScaledDecimal.from_decimal(x)
+
+		for (coefficient, scale) in [(15, -1), (1.5, 0), (15, 1.0), (True, 0), ("15", 1)]:
+			with self.subTest(coefficient=coefficient, scale=scale):
+				with self.assertRaises(TypeError):
+					ScaledDecimal(coefficient, scale)
+
+				with self.assertRaises(TypeError):
+					ScaledDecimal(1, 0)._replace(coefficient=coefficient, scale=scale)
+
+				with self.assertRaises(TypeError):
+					ScaledDecimal._make([coefficient, scale])
+
+		# Test replacing fields keeps valid values.
+		with self.subTest():
+			self.assertEqual(ScaledDecimal(1, 0)._replace(scale=2), ScaledDecimal(1, 2))
+
+		for v in [decimal.Decimal("1.5"), (15, 1)]:
+			with self.subTest(v=v):
+				with self.assertRaises(TypeError):
+					scaledDecimalCanonicalMap(v)
+
 	def test_stringLexicalMap(self) -> None:
 		valid_inputs = [
 			("foo", "foo"),
@@ -941,6 +1225,34 @@ class TestDatatypesMappings(unittest.TestCase):
 				with self.assertRaises(TypeError):
 					stringLexicalMap(s)
 
+	def test_stringLexicalMap_fast_path(self) -> None:
+		characters = ["\x00", "\x01", "a", "\x7f", "\x80", "\ud7ff", "\ud800", "\udbff\udfff", "\ue000", "\ufffd", "\ufffe", "\uffff", "\U00010000", "\U0010ffff"]
+		literals = ["".join(x) for n in range(3) for x in itertools.product(characters, repeat=n)] + ["a" * 100000, "a" * 100000 + "\x00"]
+
+		# Test the fast path agrees with the regular expression, in results and in errors.
+		for LEX in literals:
+			with self.subTest(LEX=LEX[:10]):
+				expected = re.fullmatch(stringRep, LEX) is not None
+
+				self.assertEqual(String.in_lexical_space(LEX), expected)
+				self.assertEqual(String.in_lexical_space_many([LEX]), [expected])
+
+				# NOTE: This is the check used where 'str.isascii' is missing (before Python 3.7).
+				with unittest.mock.patch.object(datatypes, "_isASCII", datatypes._isASCIIEncodable):
+					self.assertEqual(String.in_lexical_space(LEX), expected)
+
+				if expected:
+					self.assertEqual(stringLexicalMap(LEX), LEX)
+				else:
+					with self.assertRaisesRegex(TypeError, "Does not match production"):
+						stringLexicalMap(LEX)
+
+		# Test chunked validation agrees with validating the joined string.
+		for LEX in literals[:len(characters) ** 2]:
+			for fragments in [[LEX], [LEX[:1], LEX[1:]], list(LEX), []]:
+				with self.subTest(fragments=fragments):
+					self.assertEqual(String.in_lexical_space_chunked(iter(fragments)), re.fullmatch(stringRep, "".join(fragments)) is not None)
+
 	def test_booleanLexicalMap(self) -> None:
 		valid_inputs = [
 			("true", True),
@@ -1015,6 +1327,268 @@ class TestDatatypesMappings(unittest.TestCase):
 				with self.assertRaises(TypeError):
 					booleanCanonicalMap(B)
 
+	def test_floatingPointLexicalMap(self) -> None:
+		valid_inputs = [
+			(floatLexicalMap, "0.1", decimal.Decimal(13421773 * 2.0**-27)),
+			(floatLexicalMap, "16777217", decimal.Decimal(16777216)),
+			(floatLexicalMap, "16777219", decimal.Decimal(16777220)),
+			(floatLexicalMap, "1E-45", decimal.Decimal(2.0**-149)),
+			(floatLexicalMap, "7.006E-46", decimal.Decimal("0")),
+			(floatLexicalMap, "-1E-50", decimal.Decimal("-0")),
+			(floatLexicalMap, "3.4028235E38", decimal.Decimal((2**24 - 1) * 2**104)),
+			(floatLexicalMap, "3.40282357E38", decimal.Decimal("Infinity")),
+			(floatLexicalMap, "1.000000059604644775390625" + "0" * 1000 + "1", decimal.Decimal(1 + 2.0**-23)),
+			(floatLexicalMap, "-1E99999999999", decimal.Decimal("-Infinity")),
+			(floatLexicalMap, "1E-99999999999", decimal.Decimal("0")),
+			(doubleLexicalMap, "0.1", decimal.Decimal(0.1)),
+			(doubleLexicalMap, "9007199254740993", decimal.Decimal(9007199254740992)),
+			(doubleLexicalMap, "3E-324", decimal.Decimal(2.0**-1074)),
+			(doubleLexicalMap, "2E-324", decimal.Decimal("0")),
+			(doubleLexicalMap, "1.7976931348623158E308", decimal.Decimal((2**53 - 1) * 2**971)),
+			(doubleLexicalMap, "1E309", decimal.Decimal("Infinity")),
+			(doubleLexicalMap, "9" * 5000 + "E-5000", decimal.Decimal(1)),
+		]
+
+		# Test valid inputs are rounded exactly, whatever their length.
+		for (f, LEX, nV) in valid_inputs:
+			with self.subTest(f=f.__name__, LEX=LEX[:40]):
+				self.assertEqual(f(LEX), nV)
+				self.assertEqual(str(f(LEX))[0] == "-", str(nV)[0] == "-")
+
+		numerals = list(itertools.product(["", "-"], ["0", "1", "98765432109876543210"], ["", "5", "0000000000000000000000000001"], range(-330, 320, 7)))
+
+		# Test double values agree with the integer rounding of the literal's digits.
+		for (s, i, f, e) in numerals:
+			LEX = "{}{}.{}E{}".format(s, i, f, e)
+
+			with self.subTest(LEX=LEX):
+				self.assertEqual(doubleLexicalMap(LEX), _binaryFloatingPointRound(1 if s else 0, int(i + f), e - len(f), 53, -1074, 971))
+
+		# Test the spec-literal mappings round exactly too, for literals within the decimal context precision.
+		for (s, i, f, e) in numerals:
+			LEX = "{}{}.{}E{}".format(s, i, f, e)
+
+			if len(i + f) > 28:
+				continue
+
+			for mapping in [floatLexicalMap, doubleLexicalMap]:
+				with self.subTest(f=mapping.__name__, LEX=LEX):
+					with unittest.mock.patch.object(datatypes, "spec_literal", True):
+						expected = repr(mapping(LEX))
+
+					self.assertEqual(repr(mapping(LEX)), expected)
+
+	def test_floatingPointCanonicalMap(self) -> None:
+		valid_inputs = [
+			(floatCanonicalMap, "0.1", "1.0E-1"),
+			(floatCanonicalMap, "-1.5", "-1.5E0"),
+			(floatCanonicalMap, "123456789", "1.2345679E8"),
+			(floatCanonicalMap, "1E-45", "1.0E-45"),
+			(floatCanonicalMap, "3E-45", "3.0E-45"),
+			(floatCanonicalMap, "3.4028235E38", "3.4028235E38"),
+			(floatCanonicalMap, "1.17549435E-38", "1.1754944E-38"),
+			(floatCanonicalMap, "-0", "-0.0E0"),
+			(floatCanonicalMap, "-INF", "-INF"),
+			(floatCanonicalMap, "NaN", "NaN"),
+			(doubleCanonicalMap, "0.1", "1.0E-1"),
+			(doubleCanonicalMap, "123456789", "1.23456789E8"),
+			(doubleCanonicalMap, "4.9E-324", "5.0E-324"),
+			(doubleCanonicalMap, "1.7976931348623157E308", "1.7976931348623157E308"),
+			(doubleCanonicalMap, "1E21", "1.0E21"),
+			(doubleCanonicalMap, "0", "0.0E0"),
+			(doubleCanonicalMap, "INF", "INF"),
+		]
+
+		invalid_inputs = [
+			1.5,
+			1,
+			"1.0E0",
+			None,
+		]
+
+		lexicalMaps = { floatCanonicalMap: floatLexicalMap, doubleCanonicalMap: doubleLexicalMap }
+
+		# Test valid inputs have the shortest canonical representation that maps back to them.
+		for (f, LEX, c) in valid_inputs:
+			with self.subTest(f=f.__name__, LEX=LEX):
+				self.assertEqual(f(lexicalMaps[f](LEX)), c)
+
+				if LEX != "NaN":
+					self.assertEqual(str(lexicalMaps[f](c)), str(lexicalMaps[f](LEX)))
+
+		# Test values that are not float values are rounded to one first.
+		with self.subTest():
+			self.assertEqual(floatCanonicalMap(decimal.Decimal("0.1")), "1.0E-1")
+			self.assertEqual(floatCanonicalMap(decimal.Decimal("1E39")), "INF")
+
+		# Test nothing is written to stdout.
+		with self.subTest():
+			with unittest.mock.patch("sys.stdout") as stdout:
+				floatCanonicalMap(decimal.Decimal(1))
+				doubleCanonicalMap(decimal.Decimal(1))
+
+			self.assertEqual(stdout.mock_calls, [])
+
+		# Test invalid inputs raise TypeError.
+		for f in lexicalMaps:
+			for x in invalid_inputs:
+				with self.subTest(f=f.__name__, x=x):
+					with self.assertRaises(TypeError):
+						f(x)
+
+	def test_durationMap_scanner(self) -> None:
+		def results(f: typing.Callable[[str], typing.Any], literals: typing.List[str]) -> typing.List[typing.Any]:
+			output = []
+
+			for literal in literals:
+				try:
+					v = f(literal)
+					output.append((v, str(v.seconds)))
+				except TypeError as e:
+					output.append(str(e))
+
+			return output
+
+		rng = random.Random(12)
+
+		literals = ["".join(x) for n in range(5) for x in itertools.product("-PYMDTHS1.", repeat=n)]
+		literals += ["-P" + "".join(rng.choice(["", rng.choice(["0", "12", ".5", "3.", "007", "9" * 40]) + u]) for u in "YMD") + rng.choice(["", "T"]) + "".join(rng.choice(["", rng.choice(["0", "12", ".5", "3.", "1.25", "9" * 40]) + u]) for u in "HMS") for _ in range(2000)]
+		literals += ["P1Y2M3DT4H5M6.7S", "P\u0663D", "P1D ", 123]
+
+		# Test the scanner agrees with the regular expression mappings, in values and in rejections.
+		for f in [durationMap, yearMonthDurationMap, dayTimeDurationMap]:
+			with unittest.mock.patch.object(datatypes, "_scanDuration", lambda *args: None):
+				expected = results(f, literals)
+
+			with self.subTest(f=f.__name__):
+				self.assertEqual(results(f, literals), expected)
+
+	def test_floatingPointNativeMap(self) -> None:
+		literals = ["1", "-0", "+0.0", "INF", "+INF", "-INF", "NaN", "0.1", "1.5E2", ".5", "1.", "-1E-50", "1E39", "3.4028235E38", "3.40282357E38", "1E-45", "7.006E-46", "1E309", "4.9E-324"]
+
+		# Ties between two float values, which rounding through double would get wrong.
+		literals += ["1.000000059604644775390625001", "1.000000059604644775390625", "1.000000178813934326171874999", "16777217", "-16777219"]
+
+		for (f, f_ref, c, c_ref) in [(floatNativeLexicalMap, floatLexicalMap, floatNativeCanonicalMap, floatCanonicalMap), (doubleNativeLexicalMap, doubleLexicalMap, doubleNativeCanonicalMap, doubleCanonicalMap)]:
+			# Test native values agree with the reference mappings, including signed zero.
+			for LEX in literals:
+				with self.subTest(f=f.__name__, LEX=LEX):
+					(x, d) = (f(LEX), f_ref(LEX))
+
+					self.assertIsInstance(x, float)
+
+					if d.is_nan():
+						self.assertTrue(math.isnan(x))
+					else:
+						self.assertEqual(x, float(d))
+						self.assertEqual(math.copysign(1, x), math.copysign(1, d))
+
+					self.assertEqual(c(x), c_ref(d))
+
+			# Test invalid inputs raise TypeError.
+			for x in ["foo", "inf", " 1", 1]:
+				with self.subTest(f=f.__name__, x=x):
+					with self.assertRaises(TypeError):
+						f(x)
+
+			for x in [decimal.Decimal(1), 1, "1.0E0"]:
+				with self.subTest(c=c.__name__, x=x):
+					with self.assertRaises(TypeError):
+						c(x)
+
+		# Test doubles that are not float values are rounded to one first.
+		with self.subTest():
+			self.assertEqual(floatNativeCanonicalMap(0.1), "1.0E-1")
+			self.assertEqual(floatNativeCanonicalMap(1e300), "INF")
+
+	def test_DurationValue(self) -> None:
+		P = durationMap
+
+		# Test duration values are immutable, hashable and compact.
+		with self.subTest():
+			v = P("-P1Y2M3DT4H5M6.7S")
+
+			self.assertEqual(v, DurationValue(-14, decimal.Decimal("-273906.7")))
+			self.assertEqual(durationCanonicalMap(v), "-P1Y2M3DT4H5M6.7S")
+			self.assertFalse(hasattr(v, "__dict__"))
+
+			with self.assertRaises(AttributeError):
+				v.months = 0  # type: ignore
+
+			self.assertEqual(len({ P("P1D"), P("PT24H"), P("P1M"), P("P30D") }), 3)
+
+		# Test equality is identity in the value space.
+		with self.subTest():
+			self.assertNotEqual(P("P1M"), P("P30D"))
+			self.assertNotEqual(P("P1D"), (0, decimal.Decimal(86400)))
+			self.assertNotEqual((0, decimal.Decimal(86400)), P("P1D"))
+
+		comparable = [
+			("P1D", "PT24H1S"),
+			("P1M", "P1M1D"),
+			("P27D", "P1M"),
+			("P1M", "P32D"),
+			("-P1M", "P0D"),
+			("P1Y", "P367D"),
+			("P1Y", "P13M"),
+		]
+
+		# Test the order relation.
+		for (x, y) in comparable:
+			with self.subTest(x=x, y=y):
+				self.assertTrue(P(x) < P(y) and P(x) <= P(y) and P(y) > P(x) and P(y) >= P(x))
+				self.assertFalse(P(y) < P(x) or P(y) <= P(x) or P(x) > P(y) or P(x) >= P(y))
+
+		# Test incomparable durations are neither less nor greater.
+		for (x, y) in [("P1M", "P30D"), ("P1M", "P28D"), ("P1Y", "P365D"), ("P1M", "P31D")]:
+			with self.subTest(x=x, y=y):
+				self.assertFalse(P(x) < P(y) or P(x) > P(y) or P(x) <= P(y) or P(x) >= P(y))
+
+		# Test invalid inputs raise TypeError.
+		for v in [{ "months": 0, "seconds": decimal.Decimal(0) }, (0, decimal.Decimal(0)), "P1D"]:
+			with self.subTest(v=v):
+				with self.assertRaises(TypeError):
+					durationCanonicalMap(v)
+
+	@unittest.skipIf(datatypes.numpy is None, "NumPy is not installed")
+	def test_floatingPointLexicalMapArray(self) -> None:
+		literals = ["1", "-0", "+0.0", "INF", "+INF", "-INF", "NaN", "1.5E2", ".5", "1.", "-1E-50", "1E39", "3.4028235E38", "1E-45", "foo", "inf", " 1", "", 1]
+
+		for (f, f_ref, dtype) in [(floatLexicalMapArray, floatLexicalMap, "float32"), (doubleLexicalMapArray, doubleLexicalMap, "float64")]:
+			(values, mask) = f(literals)
+
+			# Test the arrays line up with the literals.
+			with self.subTest(f=f):
+				self.assertEqual(values.dtype, dtype)
+				self.assertEqual(mask.tolist(), [True] * 14 + [False] * 5)
+
+			# Test valid literals agree with the reference mapping, including signed zero.
+			for (LEX, x) in zip(literals[:14], values[:14].tolist()):
+				with self.subTest(f=f, LEX=LEX):
+					if math.isnan(x):
+						self.assertTrue(f_ref(LEX).is_nan())
+					else:
+						self.assertEqual(x, float(f_ref(LEX)))
+						self.assertEqual(math.copysign(1, x), math.copysign(1, f_ref(LEX)))
+
+			# Test invalid literals map to NaN.
+			with self.subTest(f=f):
+				self.assertTrue(all(math.isnan(x) for x in values[14:].tolist()))
+
+		# Test literals on a tie between two float values round exactly rather than through double.
+		for (LEX, x) in [("1.000000059604644775390625001", 1.00000011920928955078125), ("1.000000059604644775390625", 1.0), ("1.000000178813934326171874999", 1.00000011920928955078125)]:
+			with self.subTest(LEX=LEX):
+				self.assertEqual(floatLexicalMapArray([LEX])[0].tolist(), [x])
+
+	def test_floatingPointLexicalMapArray_no_numpy(self) -> None:
+		# Test the bulk mappings are unavailable without NumPy.
+		with unittest.mock.patch.object(datatypes, "numpy", None):
+			with self.assertRaises(ImportError):
+				floatLexicalMapArray(["1"])
+
+			with self.assertRaises(ImportError):
+				Double.lexical_mapping_array(["1"])
+
 
 
 ...
@@ -1078,6 +1652,33 @@ class TestDatatypesDatatypes(unittest.TestCase):
 			with self.assertRaises(TypeError):
 				ExampleDatatype(None)
 
+		class CountingDatatype(ExampleDatatype):
+			mapped = []  # type: typing.List[str]
+
+			@classmethod
+			def lexical_mapping(cls, lexical_representation: str) -> typing.Any:
+				cls.mapped.append(lexical_representation)
+
+				return lexical_representation.upper()
+
+		y = CountingDatatype("y")
+
+		# Test value and canonical_representation are mapped once.
+		with self.subTest():
+			self.assertEqual((y.value, y.value, y.canonical_representation, y.canonical_representation), ("Y", "Y", "Y", "Y"))
+			self.assertEqual(CountingDatatype.mapped, ["y"])
+
+		# Test value and canonical_representation are mapped again when lexical_representation changes.
+		with self.subTest():
+			y.lexical_representation = "z"
+			self.assertEqual((y.value, y.canonical_representation), ("Z", "Z"))
+			self.assertEqual(CountingDatatype.mapped, ["y", "z"])
+
+		# Test instances have no __dict__.
+		for x in [String("foo"), Boolean("true"), Decimal("1.0"), Float("1.0"), Double("1.0"), Duration("P1D")]:
+			with self.subTest(x=x):
+				self.assertFalse(hasattr(x, "__dict__"))
+
 
 	def test_String(self) -> None:
 		valid_inputs = [
@@ -1327,3 +1928,280 @@ class TestDatatypesDatatypes(unittest.TestCase):
 			with self.subTest(s=s):
 				with self.assertRaises(TypeError):
 					Decimal(s)
+
+	def test_mapping_cache(self) -> None:
+		self.addCleanup(Decimal.disable_mapping_cache)
+		self.addCleanup(Float.disable_mapping_cache)
+		self.addCleanup(Duration.disable_mapping_cache)
+
+		# Test caches are opt-in.
+		with self.subTest():
+			self.assertEqual(Decimal.mapping_cache_info(), {})
+
+		Decimal.enable_mapping_cache(maxsize=2)
+
+		for s in ["1.0", "1.0", "2.0", "1.0", "3.0", "1.0"]:
+			Decimal.lexical_mapping(s)
+
+		Decimal.canonical_mapping(decimal.Decimal("1.0"))
+
+		# Test hits, misses and least-recently-used evictions are counted.
+		with self.subTest():
+			self.assertEqual(Decimal.mapping_cache_info()["lexical_mapping"], MappingCacheInfo(hits=3, misses=3, evictions=1, size=2, maxsize=2))
+
+		with self.subTest():
+			self.assertEqual(Decimal.mapping_cache_info()["canonical_mapping"], MappingCacheInfo(hits=0, misses=1, evictions=0, size=1, maxsize=2))
+
+		Decimal.enable_mapping_cache(maxsize=2, eviction="fifo")
+
+		for s in ["1.0", "1.0", "2.0", "1.0", "3.0", "1.0"]:
+			Decimal.lexical_mapping(s)
+
+		# Test first-in-first-out evictions.
+		with self.subTest():
+			self.assertEqual(Decimal.mapping_cache_info()["lexical_mapping"], MappingCacheInfo(hits=2, misses=4, evictions=2, size=2, maxsize=2))
+
+		# Test invalid literals are not cached.
+		with self.subTest():
+			with self.assertRaises(AssertionError):
+				Decimal.lexical_mapping("foo")
+
+			with self.assertRaises(TypeError):
+				Decimal.lexical_mapping(123)
+
+			self.assertEqual(Decimal.mapping_cache_info()["lexical_mapping"].size, 2)
+
+		# Test bad configurations raise TypeError.
+		with self.subTest():
+			with self.assertRaises(TypeError):
+				Decimal.enable_mapping_cache(maxsize=0)
+
+			with self.assertRaises(TypeError):
+				Decimal.enable_mapping_cache(eviction="foo")
+
+		Float.enable_mapping_cache()
+
+		# Test equal values with different representations are cached separately.
+		with self.subTest():
+			self.assertEqual([Float.canonical_mapping(decimal.Decimal(x)) for x in ["0", "-0", "0", "-0"]], ["0.0E0", "-0.0E0", "0.0E0", "-0.0E0"])
+
+		Duration.enable_mapping_cache()
+
+		# Test cached values cannot be altered.
+		with self.subTest():
+			v = Duration.lexical_mapping("P1D")
+
+			with self.assertRaises(AttributeError):
+				v.seconds = decimal.Decimal(0)  # type: ignore
+
+			self.assertEqual(Duration.lexical_mapping("P1D"), DurationValue(0, decimal.Decimal(86400)))
+
+		# Test caches are not inherited.
+		with self.subTest():
+			self.assertEqual(Double.mapping_cache_info(), {})
+
+		Decimal.disable_mapping_cache()
+
+		# Test caches can be disabled.
+		with self.subTest():
+			self.assertEqual(Decimal.mapping_cache_info(), {})
+
+	def test_native_values(self) -> None:
+		self.addCleanup(Float.disable_native_values)
+		self.addCleanup(Double.disable_native_values)
+		self.addCleanup(Float.disable_mapping_cache)
+
+		Float.enable_mapping_cache()
+
+		# Test values are decimal.Decimal values by default.
+		with self.subTest():
+			self.assertEqual(Float("1.5").value, decimal.Decimal("1.5"))
+
+		Float.enable_native_values()
+		Double.enable_native_values()
+
+		# Test native mode maps to and from Python floats, and empties the caches.
+		with self.subTest():
+			self.assertEqual(Float.mapping_cache_info()["lexical_mapping"].size, 0)
+			self.assertEqual([repr(Float(x).value) for x in ["0.1", "-0", "INF", "NaN"]], ["0.10000000149011612", "-0.0", "inf", "nan"])
+			self.assertEqual([repr(Double(x).value) for x in ["0.1", "-0", "-INF"]], ["0.1", "-0.0", "-inf"])
+			self.assertEqual([Float(x).canonical_representation for x in ["0.1", "-0", "+INF", "NaN"]], ["1.0E-1", "-0.0E0", "INF", "NaN"])
+			self.assertEqual(Double.lexical_mapping_many(["1E2", "foo"]).results, [100.0, None])
+			self.assertEqual(Double.canonical_mapping_many([100.0]).results, ["1.0E2"])
+
+		Float.disable_native_values()
+
+		# Test disabling native mode restores decimal.Decimal values.
+		with self.subTest():
+			self.assertEqual(Float("1.5").value, decimal.Decimal("1.5"))
+			self.assertIsInstance(Double("1.5").value, float)
+
+	def test_mapping_many(self) -> None:
+		valid_inputs = [
+			(String, ["", "foo"], ["", "foo"], ["", "foo"]),
+			(Boolean, ["true", "0"], [True, False], ["true", "false"]),
+			(Decimal, ["1.0", "-.5"], [decimal.Decimal("1.0"), decimal.Decimal("-.5")], ["1", "-0.5"]),
+			(Float, ["1", "-INF"], [decimal.Decimal(1), decimal.Decimal("-Infinity")], ["1.0E0", "-INF"]),
+			(Double, ["1E2", "INF"], [decimal.Decimal(100), decimal.Decimal("Infinity")], ["1.0E2", "INF"]),
+			(Duration, ["P1D", "-PT1M"], [DurationValue(0, decimal.Decimal(86400)), DurationValue(0, decimal.Decimal(-60))], ["P1D", "-PT1M"]),
+		]
+
+		# Test batches agree with the per-item classmethods.
+		for (datatype, literals, values, canonicals) in valid_inputs:
+			with self.subTest(datatype=datatype):
+				self.assertEqual(datatype.in_lexical_space_many(literals), [True] * len(literals))
+				self.assertEqual(datatype.lexical_mapping_many(literals), BatchResults(values, []))
+				self.assertEqual(datatype.canonical_mapping_many(values), BatchResults(canonicals, []))
+				self.assertEqual(datatype.canonical_mapping_many(values).results, [datatype.canonical_mapping(v) for v in values])
+
+		# Test bad items are reported without stopping the batch.
+		with self.subTest():
+			self.assertEqual(Decimal.in_lexical_space_many(["1", "foo", 1, "2"]), [True, False, False, True])
+
+			(results, errors) = Decimal.lexical_mapping_many(["1", "foo", 1, "2"])
+
+			self.assertEqual(results, [decimal.Decimal(1), None, None, decimal.Decimal(2)])
+			self.assertEqual([i for (i, e) in errors], [1, 2])
+			self.assertTrue(all(isinstance(e, TypeError) for (i, e) in errors))
+
+			(results, errors) = Decimal.canonical_mapping_many([decimal.Decimal(1), decimal.Decimal("Infinity"), "1"])
+
+			self.assertEqual(results, ["1", None, None])
+			self.assertEqual([i for (i, e) in errors], [1, 2])
+
+		# Test batches go through the mapping caches.
+		with self.subTest():
+			self.addCleanup(Boolean.disable_mapping_cache)
+
+			Boolean.enable_mapping_cache()
+
+			self.assertEqual(Boolean.lexical_mapping_many(["true", "true", "false"]).results, [True, True, False])
+			self.assertEqual(Boolean.mapping_cache_info()["lexical_mapping"][:2], (1, 2))
+
+	def test_try_parse(self) -> None:
+		# Test valid literals give the same results as the raising classmethods.
+		with self.subTest():
+			self.assertEqual(Decimal.try_parse("1.50").lexical_representation, Decimal("1.50").lexical_representation)
+			self.assertEqual(Decimal.try_parse("1.50").value, decimal.Decimal("1.50"))
+			self.assertEqual(Decimal.try_lexical_mapping("1.50"), Decimal.lexical_mapping("1.50"))
+			self.assertEqual(Duration.try_lexical_mapping("P1D"), Duration.lexical_mapping("P1D"))
+
+		# Test a false value stays distinguishable from a failure.
+		with self.subTest():
+			self.assertIs(Boolean.try_lexical_mapping("false"), False)
+			self.assertNotIsInstance(Boolean.try_lexical_mapping("false"), InvalidLiteral)
+
+		# Test the mappings give the same values when they skip their check of the literal.
+		for datatype in [Float, Double]:
+			for LEX in ["1", "-0", "+0.0", "INF", "+INF", "-INF", "NaN", ".5", "1.", "-1.5E-50", "1E39", "1E309", "4.9E-324", "16777217", "-.5e+3", "+0E0", "1" * 40 + "E-40"]:
+				with self.subTest(datatype=datatype.__name__, LEX=LEX):
+					self.assertEqual(str(datatype.try_lexical_mapping(LEX)), str(datatype.parse(LEX)))
+
+		# Test bad literals give a falsy InvalidLiteral instead of raising.
+		for (datatype, literal) in [(Decimal, "foo"), (Decimal, 1), (Boolean, "yes"), (Float, "1.0e"), (Duration, "P")]:
+			with self.subTest(datatype=datatype, literal=literal):
+				for result in [datatype.try_parse(literal), datatype.try_lexical_mapping(literal)]:
+					self.assertIsInstance(result, InvalidLiteral)
+					self.assertFalse(result)
+					self.assertIs(result.datatype, datatype)
+					self.assertEqual(result.literal, literal)
+					self.assertEqual(result.message, "Literal not in lexical space: {}".format(literal))
+
+		# Test try_lexical_mapping goes through the mapping cache, which bad literals never reach.
+		with self.subTest():
+			self.addCleanup(Decimal.disable_mapping_cache)
+
+			Decimal.enable_mapping_cache()
+
+			self.assertEqual([Decimal.try_lexical_mapping(x) for x in ["1", "1", "foo"]][:2], [decimal.Decimal(1)] * 2)
+			self.assertEqual(Decimal.mapping_cache_info()["lexical_mapping"][:2], (1, 1))
+
+	def test_parse_format(self) -> None:
+		valid_inputs = [
+			(String, "foo", "foo"),
+			(Boolean, "1", True),
+			(Decimal, "-01.50", decimal.Decimal("-1.50")),
+			(Float, "1E1", decimal.Decimal(10)),
+			(Double, "-INF", decimal.Decimal("-Infinity")),
+			(Duration, "PT36H", DurationValue(0, decimal.Decimal(129600))),
+		]
+
+		# Test parse and format agree with the instance and the raising classmethods.
+		for (datatype, literal, value) in valid_inputs:
+			with self.subTest(datatype=datatype):
+				self.assertEqual(datatype.parse(literal), value)
+				self.assertEqual(datatype.parse(literal), datatype(literal).value)
+				self.assertEqual(datatype.format(value), datatype.canonical_mapping(value))
+				self.assertEqual(datatype.format(value), datatype(literal).canonical_representation)
+
+		class Upper(String):
+			@classmethod
+			def lexical_mapping(cls, lexical_representation: str) -> str:
+				return lexical_representation.upper()
+
+			@classmethod
+			def canonical_mapping(cls, value: str) -> str:
+				return value.lower()
+
+		# Test subclasses that override the raising classmethods are mapped by their overrides.
+		with self.subTest():
+			self.assertEqual([Upper("abc").value, Upper("abc").canonical_representation], ["ABC", "abc"])
+			self.assertEqual([Upper.parse("abc"), Upper.format("ABC")], ["ABC", "abc"])
+			self.assertEqual(Upper.lexical_mapping_many(["a", "b"]).results, ["A", "B"])
+			self.assertEqual(String("abc").value, "abc")
+
+		# Test bad input raises TypeError, as the mapping functions do.
+		for (datatype, x) in [(Decimal, "foo"), (Decimal, 1), (Boolean, "yes"), (Duration, "P")]:
+			with self.subTest(datatype=datatype, x=x):
+				with self.assertRaises(TypeError):
+					datatype.parse(x)
+
+		with self.subTest():
+			with self.assertRaises(TypeError):
+				Decimal.format("1")
+
+		# Test parse and format go through the mapping caches.
+		with self.subTest():
+			self.addCleanup(Decimal.disable_mapping_cache)
+
+			Decimal.enable_mapping_cache()
+
+			self.assertEqual([Decimal.parse("2.5"), Decimal.parse("2.5")], [decimal.Decimal("2.5")] * 2)
+			self.assertEqual(Decimal.format(decimal.Decimal("2.5")), "2.5")
+			self.assertEqual(Decimal.mapping_cache_info()["lexical_mapping"][:2], (1, 1))
+			self.assertEqual(Decimal.mapping_cache_info()["canonical_mapping"][:2], (0, 1))
+
+	def test_bytes(self) -> None:
+		buffer = memoryview(b"true,-1.5,1E-1,INF,-P1DT2H,1.0.0,\xc3\xa9t\xc3\xa9")
+		fields = [buffer[m.start():m.end()] for m in re.finditer(rb"[^,]+", buffer.tobytes())]
+
+		# Test bytes, bytearrays and memoryview slices are checked as their UTF-8 decodings are.
+		for datatype in [String, Boolean, Decimal, Float, Double, Duration]:
+			for field in fields:
+				for literal in [field, field.tobytes(), bytearray(field)]:
+					with self.subTest(datatype=datatype, literal=literal):
+						self.assertEqual(datatype.in_lexical_space_bytes(literal), datatype.in_lexical_space(str(field, "utf-8")))
+
+			with self.subTest(datatype=datatype):
+				self.assertEqual(datatype.in_lexical_space_bytes_many(fields), [datatype.in_lexical_space(str(f, "utf-8")) for f in fields])
+
+		# Test lexical mappings of byte strings agree with those of the decoded literals.
+		with self.subTest():
+			self.assertIs(Boolean.lexical_mapping_bytes(fields[0]), True)
+			self.assertEqual(Decimal.lexical_mapping_bytes(fields[1]), decimal.Decimal("-1.5"))
+			self.assertEqual(Float.lexical_mapping_bytes(bytearray(fields[2])), Float.lexical_mapping("1E-1"))
+			self.assertEqual(Duration.lexical_mapping_bytes(fields[4].tobytes()), DurationValue(0, decimal.Decimal(-93600)))
+			self.assertEqual(String.lexical_mapping_bytes(fields[6]), "été")
+
+		# Test strings, malformed UTF-8 and bad literals are rejected.
+		for literal in ["true", b"\xff", b"tru\xc3"]:
+			with self.subTest(literal=literal):
+				self.assertFalse(Boolean.in_lexical_space_bytes(literal))
+				self.assertEqual(Boolean.in_lexical_space_bytes_many([literal]), [False])
+
+				with self.assertRaises(TypeError):
+					Boolean.lexical_mapping_bytes(literal)
+
+		with self.subTest():
+			with self.assertRaises(TypeError):
+				Decimal.lexical_mapping_bytes(fields[5])
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+
+import concurrent.futures
+import random
+import sys
+import time
+import unittest
+
+from .. import regular_expressions
+from ..regular_expressions import *
+
+
+class TestRegularExpressions(unittest.TestCase):
+	def test_compile_regex(self) -> None:
+		valid_inputs = [
+			("", [""], ["a"]),
+			("abc", ["abc"], ["ab", "abcd", "xabc"]),
+			("a|bc", ["a", "bc"], ["abc", ""]),
+			("(a|aa)*b", ["b", "aaab"], ["aaa", "ba"]),
+			("x{2}y{1,2}z{0,}", ["xxy", "xxyyzzz"], ["xy", "xxyyy"]),
+			("^a$", ["^a$"], ["a"]),
+			(".", ["a", "é", "\U0001f600"], ["\n", "\r", ""]),
+			("\\s\\S", [" a", "\ta"], ["a ", " a"]),
+			("\\d+", ["12", "١٢"], ["1a", "²"]),
+			("\\w\\W", ["a.", "é "], ["._", "a_b"]),
+			("\\i\\c*", ["_a-1.b", ":x"], ["1a", "-a"]),
+			("\\p{Lu}\\P{Lu}", ["Ab", "É1"], ["aB", "AB"]),
+			("\\p{L}+", ["abcé一"], ["a1"]),
+			("\\p{IsBasicLatin}+", ["abc~"], ["é"]),
+			("\\p{IsGreek}", ["α"], ["a"]),
+			("[a-z-[aeiou]]+", ["bcd"], ["bad"]),
+			("[^a-c]", ["d", "\n"], ["b"]),
+			("[\\p{L}-[\\p{Lu}]]", ["a"], ["A", "1"]),
+			("[+--]", ["+", ",", "-"], ["."]),
+			("[-a][a-]", ["-a", "a-"], ["b-"]),
+			("[\\^\\[\\]\\-]", ["^", "[", "]", "-"], ["\\"]),
+			("\\n\\r\\t\\\\\\|\\.\\?\\*\\+\\(\\)\\{\\}", ["\n\r\t\\|.?*+(){}"], []),
+			("[a-[a]]?", [""], ["a"]),
+		]
+
+		# Test matching follows XSD rather than Python rules.
+		for (regex, matching, not_matching) in valid_inputs:
+			with self.subTest(regex=regex):
+				compiled = compile_regex(regex)
+
+				self.assertEqual([compiled.fullmatch(s) is not None for s in matching], [True] * len(matching))
+				self.assertEqual([compiled.fullmatch(s) is not None for s in not_matching], [False] * len(not_matching))
+
+		# Test several regular expressions are compiled as alternatives.
+		with self.subTest():
+			self.assertEqual([compile_regex("[0-9]+", "[a-z]+").fullmatch(s) is not None for s in ["12", "ab", "a1"]], [True, True, False])
+
+		invalid_inputs = ["(", ")", "(a", "a)", "a**", "a+?", "*", "{1}", "a{", "a{2,1}", "a{,2}", "]", "[", "[]", "[^]", "[a", "[a[b]]", "[z-a]", "[a-\\d]", "[\\d-z]", "[a-b-c]", "\\", "\\x", "\\p{Foo}", "\\p{IsFoo}", "\\p{Lu", "a{99999999999}", "a{1,4294967295}", 1]
+
+		# Test malformed regular expressions raise TypeError.
+		for regex in invalid_inputs:
+			with self.subTest(regex=regex):
+				with self.assertRaises(TypeError):
+					compile_regex(regex)
+
+				with self.assertRaises(TypeError):
+					LinearRegex(regex)
+
+		# Test compiled patterns are kept by the text of the regular expression.
+		with self.subTest():
+			self.assertIs(compile_regex("[a-z-[aeiou]]+"), compile_regex("[a-z-[aeiou]]+"))
+			self.assertIs(compile_regex("a", "b"), compile_regex("a", "b"))
+
+	def test_LinearRegex(self) -> None:
+		regexes = ["", "abc", "a|bc", "(a|aa)*b", "(a*)*b", "x{2}y{1,2}z{0,}", "(ab|a)*(ba)?", "((a|b){0,3}c)+", "[^a]*", "\\d+(\\.\\d{1,2})?", "\\p{L}{2,}"]
+		rng = random.Random(0)
+		strings = [""] + ["".join(rng.choice("abcxyz1.é") for _ in range(rng.randrange(1, 8))) for _ in range(500)]
+
+		# Test matching agrees with the backtracking patterns, however small the state cache.
+		for regex in regexes:
+			for max_states in [3, 1024]:
+				with self.subTest(regex=regex, max_states=max_states):
+					(compiled, linear) = (compile_regex(regex), LinearRegex(regex, max_states=max_states))
+
+					self.assertEqual([linear.fullmatch(s) for s in strings], [compiled.fullmatch(s) is not None for s in strings])
+					self.assertLessEqual(linear.cache_size(), max_states)
+
+		# Test pathological patterns take linear time (these would take the backtracking patterns far longer).
+		with self.subTest():
+			self.assertFalse(LinearRegex("(a*)*b").fullmatch("a" * 10000))
+			self.assertTrue(LinearRegex("(a|aa)*b").fullmatch("a" * 10000 + "b"))
+
+		# Test several regular expressions are matched as alternatives, and matchers are kept.
+		with self.subTest():
+			self.assertEqual([LinearRegex("[0-9]+", "[a-z]+").fullmatch(s) for s in ["12", "ab", "a1"]], [True, True, False])
+			self.assertIs(compile_linear_regex("a", "b"), compile_linear_regex("a", "b"))
+
+		# Test transitions are kept per class of characters, so distinct characters don't each add one.
+		with self.subTest():
+			linear = LinearRegex("[^a]*")
+
+			self.assertTrue(linear.fullmatch("".join(map(chr, range(0x4E00, 0x9FFF)))))
+			self.assertLessEqual(max(len(state.transitions) for state in linear._states.values()), 2)
+
+		# Test a matcher shared between threads agrees with the backtracking pattern while its states are dropped.
+		with self.subTest():
+			(compiled, linear) = (compile_regex("((a|b|c|d){0,6}e)+"), LinearRegex("((a|b|c|d){0,6}e)+", max_states=3))
+
+			def work(seed: int) -> bool:
+				rng = random.Random(seed)
+				strings = ["".join(rng.choice("abcde") for _ in range(rng.randrange(1, 30))) for _ in range(250)]
+
+				return [linear.fullmatch(s) for s in strings] == [compiled.fullmatch(s) is not None for s in strings]
+
+			# NOTE: Switching threads often makes them more likely to build and drop states at the same time.
+			self.addCleanup(sys.setswitchinterval, sys.getswitchinterval())
+			sys.setswitchinterval(1e-6)
+
+			with concurrent.futures.ThreadPoolExecutor(8) as executor:
+				self.assertEqual(list(executor.map(work, range(32))), [True] * 32)
+
+		# Test large counts are rejected before their states are built, and the kept DFA states stay small however many
+		# NFA states each holds.
+		with self.subTest():
+			for regex in ["[0-9]{1000000}", ".{0,20000}x", "((a{1000}){1000}){1000}"]:
+				started = time.perf_counter()
+
+				with self.assertRaises(TypeError):
+					LinearRegex(regex)
+
+				self.assertLess(time.perf_counter() - started, 0.1)
+
+			linear = LinearRegex(".{0,1000}x")
+
+			self.assertTrue(linear.fullmatch("a" * 1000 + "x"))
+			self.assertLessEqual(sum(len(state.nfa_states) for state in linear._states.values()), regular_expressions._maxKeptNFAStates)
+
+		with self.subTest():
+			with self.assertRaises(TypeError):
+				LinearRegex("a", max_states=2)
+
+	def test_parse_regex(self) -> None:
+		# Test regular expressions are parsed into nodes with character classes as ranges.
+		with self.subTest():
+			self.assertEqual(parse_regex("a|[b-dx]{2,}"), Alternation((
+				CharClass(((ord("a"), ord("a")),)),
+				Repetition(CharClass(((ord("b"), ord("d")), (ord("x"), ord("x")))), 2, None),
+			)))
+			self.assertEqual(parse_regex("(ab)?"), Repetition(Sequence((CharClass(((ord("a"), ord("a")),)), CharClass(((ord("b"), ord("b")),)))), 0, 1))
+			self.assertEqual(parse_regex("[^\\n\\r]"), parse_regex("."))